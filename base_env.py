@@ -28,3 +28,98 @@ class Game:
 
     def stringRepresentation(self, board):
         pass
+
+    def makeState(self, board, player=1):
+        return GameState(self, board, player)
+
+
+class GameState:
+    """
+    (board, player to move) with derived data computed lazily, at most once each.
+    Works with any Game; games may subclass it (makeState) to share work between
+    the fields, e.g. valid moves and the terminal check.
+    If the game has a `zobrist` table, `key` is the 64-bit Zobrist hash of the
+    canonical board and subclasses update it incrementally in _successor.
+    """
+
+    def __init__(self, game, board, player=1, hashes=None):
+        self.game = game
+        self.board = board
+        self.player = player
+        self._hashes = hashes
+        self._canonical = None
+        self._key = None
+        self._valids = None
+        self._ended = None
+        self._children = {}
+        self._canon_state = None     # memoized canonical_state(), so its children are reused too
+
+    @property
+    def canonical(self):
+        if self._canonical is None:
+            self._canonical = self.board if self.player == 1 else self.game.getCanonicalForm(self.board, self.player)
+        return self._canonical
+
+    @property
+    def hashes(self):
+        """(zobrist hash of board, zobrist hash of -board)"""
+        if self._hashes is None:
+            self._hashes = self.game.zobrist.hash_pair(self.board)
+        return self._hashes
+
+    @property
+    def key(self):
+        if self._key is None:
+            if hasattr(self.game, "zobrist"):
+                h, hs = self.hashes
+                self._key = h if self.player == 1 else hs
+            else:
+                self._key = self.game.stringRepresentation(self.canonical)
+        return self._key
+
+    @property
+    def valids(self):
+        if self._valids is None:
+            self._valids = self.game.getValidMoves(self.board, self.player)
+        return self._valids
+
+    @property
+    def ended(self):
+        if self._ended is None:
+            self._ended = self.game.getGameEnded(self.board, self.player)
+        return self._ended
+
+    def canonical_state(self):
+        """The same position from the mover's point of view (player = 1)."""
+        if self.player == 1:
+            return self
+        if self._canon_state is None:
+            st = self._make(self.canonical, 1)
+            if self._hashes is not None:
+                st._hashes = self._hashes[::-1]
+            self._canon_state = st
+        return self._canon_state
+
+    def next(self, action):
+        """Successor state after `action`; cached, so search trees reuse it."""
+        child = self._children.get(action)
+        if child is None:
+            child = self._successor(action)
+            self._children[action] = child
+        return child
+
+    def _successor(self, action):
+        board, player = self.game.getNextState(self.board, self.player, action)
+        return self._make(board, player)
+
+    def _make(self, board, player):
+        return type(self)(self.game, board, player)
+
+
+def make_state(game, board, player=1):
+    """GameState for (board, player): the game's own state class when it has one."""
+    if isinstance(board, GameState):
+        return board
+    if hasattr(game, "makeState"):
+        return game.makeState(board, player)
+    return GameState(game, board, player)
@@ -0,0 +1,171 @@
+"""
+Network-free baseline players shared by the eval scripts and agents.
+
+GreedyPlayer is the one-ply greedy baseline: it plays every valid move of
+every position in one batched env.step, scores all resulting boards at once
+and keeps the best move per position, ties going to the smallest action
+(the same choices as the old per-move getNextState loops). A single position
+goes through a scalar shortcut when the game has one (Othello bitboard flip
+counts, MyKingdom TerritoryTracker), which is cheaper than one tiny batch.
+
+    greedy = greedy_player("othello", game)
+    a = greedy.play(canonical_board)
+    actions = greedy.play_batch(canonical_boards)
+
+rollout_mcts_player builds the pure-MCTS baseline: MCTS whose "network" is
+RolloutNet (uniform prior, value from random playouts run in lockstep). The
+search collects `leaf_batch` leaves per evaluation (virtual loss), so each
+random_playouts call finishes leaf_batch * playouts games at once.
+"""
+import time
+
+import numpy as np
+
+
+class GreedyPlayer:
+    """
+    env    : batched rules with valid_moves(boards, players) and step(boards, players, actions)
+    score  : (M, n, n) boards after the move -> (M,) score for the player who moved (+1)
+    single : optional (board, valids or None) -> action, same choice as play_batch
+    Boards are canonical (side to move = +1).
+    """
+
+    def __init__(self, env, score, single=None, chunk=2048):
+        self.env = env
+        self.score = score
+        self.single = single
+        self.chunk = chunk          # candidate boards per scoring call
+
+    def play_batch(self, boards, valids=None):
+        """(B,) actions for a (B, n, n) stack of canonical boards; valids optionally restricts the candidates."""
+        boards = np.asarray(boards)
+        if valids is None:
+            valids = self.env.valid_moves(boards, 1)
+        rows, acts = np.nonzero(valids)
+        scores = np.empty(len(rows))
+        for i in range(0, len(rows), self.chunk):
+            nxt, _ = self.env.step(boards[rows[i:i + self.chunk]], 1, acts[i:i + self.chunk])
+            scores[i:i + self.chunk] = self.score(nxt)
+        # per row: highest score first, then smallest action
+        order = np.lexsort((acts, -scores, rows))
+        rows, acts = rows[order], acts[order]
+        first = np.ones(len(rows), dtype=bool)
+        first[1:] = rows[1:] != rows[:-1]
+        out = np.full(len(boards), -1, dtype=int)
+        out[rows[first]] = acts[first]
+        return out
+
+    def play(self, board, valids=None):
+        if self.single is not None:
+            return int(self.single(board, valids))
+        return int(self.play_batch(np.asarray(board)[None], None if valids is None else np.asarray(valids)[None])[0])
+
+    def __call__(self, board):
+        return self.play(board)
+
+
+def batch_env(name, game):
+    """Batched rules matching `game` ("othello" or "mykingdom")."""
+    if name == "othello":
+        from othello.othello_batch import OthelloBatchEnv
+        return OthelloBatchEnv(game.n)
+    from games.mykingdom.mykingdom_batch import MyKingdomBatchEnv
+    return MyKingdomBatchEnv(game.N)
+
+
+def _othello_single(game):
+    """After a move the disc difference is diff + 2 * flips + 1, so pick the most flips."""
+    bb, n = game.bb, game.n
+
+    def best(board, valids):
+        own, opp = bb.from_array(board, 1), bb.from_array(board, -1)
+        moves = bb.legal_moves(own, opp)
+        best_a, best_f = n * n, -1            # pass when nothing is playable
+        while moves:
+            mv = moves & -moves
+            moves ^= mv
+            a = mv.bit_length() - 1
+            if valids is not None and not valids[a]:
+                continue
+            f = bb.count(bb.flips(own, opp, mv))
+            if f > best_f:
+                best_f, best_a = f, a
+        return best_a
+    return best
+
+
+def _mykingdom_single(game):
+    from games.mykingdom.territory import TerritoryTracker
+
+    def best(board, valids):
+        if valids is None:
+            valids = game.getValidMoves(board, 1)
+        moves = np.flatnonzero(valids[:game.PASS])
+        black, white = TerritoryTracker(board).score_if_played(1)
+        return moves[int(np.argmax((black - white)[moves]))]
+    return best
+
+
+def greedy_player(name, game):
+    """Greedy baseline: disc difference for "othello", territory difference for "mykingdom"."""
+    env = batch_env(name, game)
+    if name == "othello":
+        single = _othello_single(game) if getattr(game, "bb", None) is not None else None
+    else:
+        single = _mykingdom_single(game)
+    return GreedyPlayer(env, lambda boards: env.scores(boards, 1), single)
+
+
+class RolloutNet:
+    """
+    Network-free evaluator for MCTS: uniform prior over valid moves and, as the
+    value, the mean result of `playouts` uniformly random games from the
+    position, all played at once by env.random_playouts.
+    Counts playouts and time so the playout rate can be reported.
+    """
+
+    def __init__(self, game, env, playouts=16, seed=None):
+        self.game = game
+        self.env = env
+        self.playouts = playouts
+        self.rng = np.random.RandomState(seed)
+        self.num_playouts = 0
+        self.seconds = 0.0
+
+    def rollout_values(self, boards):
+        """(B,) mean playout result for the side to move (+1) of each canonical board."""
+        t = time.perf_counter()
+        boards = np.repeat(np.asarray(boards), self.playouts, axis=0)
+        result = self.env.random_playouts(boards, 1, self.rng)
+        self.num_playouts += len(result)
+        self.seconds += time.perf_counter() - t
+        return result.reshape(-1, self.playouts).mean(axis=1)
+
+    def predict(self, board):
+        valids = self.game.getValidMoves(board, 1).astype(np.float32)
+        v = self.rollout_values(np.asarray(board)[None])
+        return valids / valids.sum(), v.astype(np.float32)
+
+    def predict_batch(self, boards):
+        boards = np.asarray(boards)
+        valids = self.env.valid_moves(boards, 1).astype(np.float32)
+        return valids / valids.sum(axis=1, keepdims=True), self.rollout_values(boards).astype(np.float32)
+
+    def playout_rate(self):
+        return self.num_playouts / max(self.seconds, 1e-9)
+
+
+def rollout_mcts_player(name, game, sims=50, playouts=16, cpuct=1.0, seed=None, leaf_batch=16):
+    """
+    Pure MCTS with random playouts instead of a network. Returns (play, net);
+    net.playout_rate() gives playouts per second. leaf_batch=1 evaluates one
+    leaf at a time (plain sequential MCTS).
+    """
+    from tree_search import MCTS
+    from utils import dotdict
+    net = RolloutNet(game, batch_env(name, game), playouts, seed)
+    mcts = MCTS(game, net, dotdict({'numMCTSSims': sims, 'cpuct': cpuct, 'leafBatch': leaf_batch}))
+
+    def play(board):
+        return int(np.argmax(mcts.getActionProb(board, temp=0)))
+    return play, net
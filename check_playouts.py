@@ -0,0 +1,31 @@
+# check_playouts.py
+# 랜덤 플레이아웃 결과가 getGameEnded와 같은 규칙(무승부 = -1)인지 점검: python check_playouts.py
+import numpy as np
+
+from othello.othello_env import OthelloGame
+from othello.othello_batch import OthelloBatchEnv
+
+# 4x4, 흑(+1) 차례: 유일한 수(12)를 두면 8-8 무승부로 종국
+FORCED_DRAW = np.array([[-1,  1,  1,  1],
+                        [-1, -1,  1,  1],
+                        [-1, -1, -1,  1],
+                        [ 0, -1, -1, -1]], dtype=np.int8)
+
+
+def check_forced_draw():
+    """Both playout paths must score the forced draw as getGameEnded does (-1), for either side to move."""
+    game, env = OthelloGame(4), OthelloBatchEnv(4)
+    final, nxt = game.getNextState(FORCED_DRAW, 1, 12)
+    assert game.getScore(final, 1) == 0 and game.getGameEnded(final, 1) == -1
+    rng = np.random.RandomState(0)
+    for boards, players in ((FORCED_DRAW[None], 1), (-FORCED_DRAW[None], -1)):
+        want = game.getGameEnded(final, players)
+        for run in (env.random_playouts, env._random_playouts_arrays):
+            got = run(boards, np.array([players]), rng)
+            assert list(got) == [want], (run.__name__, players, got, want)
+    return True
+
+
+if __name__ == "__main__":
+    check_forced_draw()
+    print("forced draw: playouts match getGameEnded")
@@ -0,0 +1,36 @@
+# check_symmetries.py
+# MyKingdom 대칭 변환 점검 (sanity.py 처럼 직접 실행): python check_symmetries.py
+import numpy as np
+
+from games.mykingdom.MyKingdomGame import MyKingdomGame as Game
+from games.mykingdom.scorer import score_territory, winner_by_plus3_rule
+
+
+def check_symmetries(game, num_positions=200, seed=0):
+    """
+    Random-play positions: every transform from getSymmetries must keep the
+    policy aligned with the board (pi marks the stones), keep PASS, and leave
+    score_territory / winner_by_plus3_rule unchanged. Raises AssertionError.
+    """
+    rng = np.random.RandomState(seed)
+    N = game.N
+    for _ in range(num_positions):
+        board, cur = game.getInitBoard(), 1
+        for _ in range(rng.randint(N * N + 1)):
+            valids = game.getValidMoves(board, cur)
+            board, cur = game.getNextState(board, cur, int(rng.choice(np.flatnonzero(valids))))
+        pi = list(board.reshape(-1).astype(float)) + [0.5]
+        syms = game.getSymmetries(board, pi)
+        assert len(syms) == 8
+        for b2, p2 in syms:
+            assert p2[-1] == pi[-1]
+            assert np.array_equal(np.reshape(p2[:-1], (N, N)), b2)
+            assert score_territory(b2) == score_territory(board)
+            assert winner_by_plus3_rule(b2) == winner_by_plus3_rule(board)
+    return True
+
+
+if __name__ == "__main__":
+    for n in (3, 5, 9):
+        check_symmetries(Game(n))
+        print(f"{n}x{n}: 8 symmetries OK")
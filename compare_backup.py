@@ -0,0 +1,116 @@
+"""
+Tree vs DAG backup in MCTS (args.mctsBackup = "tree" | "dag").
+
+Both sides use the same cheap heuristic evaluator (uniform policy, value from
+the disc / territory margin), so differences come from the search alone.
+
+    python compare_backup.py --game othello --board 6 --sims 25 50 100 --games 20
+    python compare_backup.py --game mykingdom --board 7 --sims 50 100
+
+Othello: win/draw/loss of dag against tree at equal simulations.
+MyKingdom: every game ends on a full board (0-0 territory, WHITE wins), so
+results cannot separate the modes; instead it reports how often edges lead to
+an already-expanded node and how far the per-edge Q of such transposed
+children drift apart in tree mode (always 0 in dag mode).
+"""
+import argparse
+import time
+
+import numpy as np
+
+from match_simulator import Arena
+from tree_search import MCTS
+from utils import dotdict
+
+
+class HeuristicNet:
+    """predict(board) -> (uniform policy over valids, tanh(margin / scale))."""
+
+    def __init__(self, game, margin, scale):
+        self.game = game
+        self.margin = margin
+        self.scale = scale
+
+    def predict(self, board):
+        valids = self.game.getValidMoves(board, 1).astype(np.float32)
+        return valids / valids.sum(), np.array([np.tanh(self.margin(board) / self.scale)], dtype=np.float32)
+
+
+def make_game(name, n):
+    if name == "othello":
+        from othello.othello_env import OthelloGame
+        game = OthelloGame(n)
+        return game, HeuristicNet(game, lambda b: game.getScore(b, 1), n)
+    from games.mykingdom.MyKingdomGame import MyKingdomGame
+    from games.mykingdom.scorer import score_territory
+    game = MyKingdomGame(n)
+
+    def margin(b):
+        bt, wt = score_territory(b)
+        return bt - wt
+    return game, HeuristicNet(game, margin, 3.0)
+
+
+def mcts_player(game, net, sims, backup, rng, random_plies):
+    """Argmax of the visit counts; the first `random_plies` moves of each game are sampled."""
+    mcts = MCTS(game, net, dotdict({'numMCTSSims': sims, 'cpuct': 1.0, 'mctsBackup': backup,
+                                       'trackChildren': True}))
+    start = int(np.count_nonzero(game.getInitBoard()))
+
+    def _p(board):
+        pi = np.asarray(mcts.getActionProb(board, temp=1), dtype=float)
+        if np.count_nonzero(board) - start < random_plies:
+            return int(rng.choice(len(pi), p=pi / pi.sum()))
+        return int(np.argmax(pi))
+    return _p, mcts
+
+
+def transposition_stats(mcts):
+    """(edges into an already-reached child / all edges, mean Q spread over edges sharing a child)."""
+    parents = {}
+    for (s, a), c in mcts.child.items():
+        parents.setdefault(c, []).append((s, a))
+    shared = [e for e in parents.values() if len(e) > 1]
+    reuse = sum(len(e) - 1 for e in shared) / max(len(mcts.child), 1)
+    if mcts.dag:
+        spread = 0.0
+    else:
+        spread = float(np.mean([np.ptp([float(np.sum(mcts.Q[e])) for e in es]) for es in shared])) if shared else 0.0
+    return reuse, spread
+
+
+def play_match(game, net, sims, games, seed, random_plies):
+    rng = np.random.RandomState(seed)
+    np.random.seed(seed)
+    dag, m_dag = mcts_player(game, net, sims, "dag", rng, random_plies)
+    tree, m_tree = mcts_player(game, net, sims, "tree", rng, random_plies)
+    t = time.perf_counter()
+    w, l, d = Arena(dag, tree, game).playGames(games, verbose=False)
+    return (w, l, d), time.perf_counter() - t, m_dag, m_tree
+
+
+def main():
+    ap = argparse.ArgumentParser("Compare tree and DAG backup in MCTS")
+    ap.add_argument("--game", choices=["othello", "mykingdom"], default="othello")
+    ap.add_argument("--board", type=int, default=6)
+    ap.add_argument("--sims", type=int, nargs="+", default=[25, 50, 100])
+    ap.add_argument("--games", type=int, default=20, help="games per setting (split over both colors)")
+    ap.add_argument("--random_plies", type=int, default=4, help="sampled opening moves per game")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    game, net = make_game(args.game, args.board)
+    for sims in args.sims:
+        (w, l, d), dt, m_dag, m_tree = play_match(game, net, sims, args.games, args.seed, args.random_plies)
+        if args.game == "othello":
+            score = (w + 0.5 * d) / max(w + l + d, 1)
+            print(f"[{args.game} {args.board}x{args.board} sims={sims:>4}] dag vs tree W/L/D = {w}/{l}/{d} "
+                  f"(score {score:.3f}, {dt:.1f}s)")
+        for name, m in (("tree", m_tree), ("dag", m_dag)):
+            reuse, spread = transposition_stats(m)
+            print(f"    {name:>4}: {len(m.N_s):>7} nodes, {len(m.child):>7} edges, "
+                  f"edges into shared nodes {reuse:.1%}, Q spread at shared nodes {spread:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 """
 학습된 모델을 랜덤/탐욕(영토 그리디) 베이스라인과 대국시켜 정량평가.
-- 승률(W/L/D)과 평균 영토차(흑-백)를 출력.
+- 승률(W/L/D)과 (--diff_games) 평균 영토차(흑-백)를 출력.
+- 여러 체크포인트/베이스라인 리그와 Elo는 tournament.py 참고.
 - 기본 체크포인트: ./pretrained_models/mykingdom/best.pth.tar
 
 사용 예)
@@ -22,6 +23,8 @@ from tree_search import MCTS
 # 게임/네트워크 불러오기 (MyKingdom 없으면 Othello로 폴백)
 from games.mykingdom.MyKingdomGame import MyKingdomGame as Game
 from games.mykingdom.pytorch.NNet import NNetWrapper as NNet
+from baseline_players import greedy_player, rollout_mcts_player
+from games.mykingdom.scorer import score_territory
 DEFAULT_SIZE = 9
 IS_MYKINGDOM = True
 
@@ -29,12 +32,15 @@ IS_MYKINGDOM = True
 # ------------------ 베이스라인 플레이어 ------------------
 
 class RandomPlayer:
-    """유효수 중 무작위."""
-    def __init__(self, game):
+    """유효수 중 무작위. prune=True면 지배당한 수(자기 영토/죽은 중립 영역)는 제외."""
+    def __init__(self, game, prune=False):
         self.game = game
+        self.prune = prune
 
     def play(self, canonicalBoard):
         valids = self.game.getValidMoves(canonicalBoard, 1)
+        if self.prune:
+            valids = self.game.getPrunedMoves(canonicalBoard, 1, valids)
         moves = np.where(valids == 1)[0]
         return int(np.random.choice(moves))
 
@@ -42,52 +48,34 @@ class RandomPlayer:
 class GreedyTerritoryPlayer:
     """
     한 수 시뮬레이트 후, 영토 득점(흑-백)이 가장 좋아지는 수 선택.
-    - canonicalBoard(플레이어=1 시점)를 받아 유효수별로 getNextState 적용.
-    - SCORER(score_territory)가 있으면 그 점수로 평가, 없으면 합법수 개수(자유도)로 대체.
+    - canonicalBoard(플레이어=1 시점) 기준, 모든 후보 수를 배치 env로 한 번에 두고 한 번에 채점.
+    - 동점이면 action 번호가 가장 작은 수. prune=True면 지배당한 수는 후보에서 제외.
+    - play_batch: 여러 국면을 한 번에 (병렬 아레나용).
     """
-    def __init__(self, game):
+    def __init__(self, game, prune=False):
         self.game = game
+        self.prune = prune
+        self._greedy = greedy_player("mykingdom", game)
 
-    def play(self, canonicalBoard):
+    def _valids(self, canonicalBoard):
         valids = self.game.getValidMoves(canonicalBoard, 1)
-        moves = np.where(valids == 1)[0]
-        if len(moves) == 1:
-            return int(moves[0])
-
-        best_move = int(moves[0])
-        best_score = -1e9
-
-        for a in moves:
-            # canonical(플레이어=1) 기준으로 다음 상태 생성
-            nextBoard, nextPlayer = self.game.getNextState(canonicalBoard, 1, int(a))
-
-            # 평가 점수 계산
-            if SCORER is not None:
-                try:
-                    bterr, wterr = SCORER(nextBoard)
-                    score = bterr - wterr  # 흑-백
-                except Exception:
-                    score = self._mobility_score(nextBoard)
-            else:
-                score = self._mobility_score(nextBoard)
+        if self.prune:
+            valids = self.game.getPrunedMoves(canonicalBoard, 1, valids)
+        return valids
 
-            if score > best_score:
-                best_score = score
-                best_move = int(a)
-
-        return best_move
+    def play(self, canonicalBoard):
+        return self._greedy.play(canonicalBoard, self._valids(canonicalBoard))
 
-    def _mobility_score(self, board):
-        """스코어러가 없을 때의 간단 휴리스틱: 합법수(자유도)가 많을수록 좋다."""
-        valids = self.game.getValidMoves(board, 1)
-        return float(np.sum(valids))
+    def play_batch(self, canonicalBoards):
+        valids = np.array([self._valids(b) for b in canonicalBoards]) if self.prune else None
+        return self._greedy.play_batch(canonicalBoards, valids)
 
 
 # ------------------ AlphaZero 플레이어 ------------------
 
-def make_az_player(game, sims):
+def make_az_player(game, sims, prune=False):
     nnet = NNet(game)
-    mcts = MCTS(game, nnet, dotdict({'numMCTSSims': sims, 'cpuct': 1.0}))
+    mcts = MCTS(game, nnet, dotdict({'numMCTSSims': sims, 'cpuct': 1.0, 'pruneMoves': prune}))
 
     def az_play(canonicalBoard):
         pi = mcts.getActionProb(canonicalBoard, temp=0)
@@ -101,20 +89,14 @@ def make_az_player(game, sims):
 def avg_territory_diff(game, games, player1, player2):
     """
     여러 판 대국 후 최종 보드에서 평균 (흑-백) 영토 차이를 측정.
-    SCORER가 없으면 None 반환.
+    (종국 = 보드가 가득 찬 상태라 현재 규칙에선 항상 0.0)
     """
-    if SCORER is None:
-        return None
-
     diffs = []
     arena = Arena(player1, player2, game)
     for _ in range(games):
-        b, _ = arena.playSingleGame(return_boards=True)  # 확장: Arena에 이 옵션이 없다면 생략
-        try:
-            bt, wt = SCORER(b)
-            diffs.append(bt - wt)
-        except Exception:
-            pass
+        arena.playGame()
+        bt, wt = score_territory(arena.last_state.board)
+        diffs.append(bt - wt)
     return float(np.mean(diffs)) if diffs else None
 
 
@@ -127,6 +109,13 @@ def main():
     parser.add_argument('--games', type=int, default=200, help='games per matchup')
     parser.add_argument('--ckpt_dir', type=str, default='./pretrained_models/mykingdom/', help='checkpoint dir')
     parser.add_argument('--ckpt', type=str, default='best.pth.tar', help='checkpoint filename')
+    parser.add_argument('--int8', action='store_true', help='int8 quantized CPU inference for MCTS')
+    parser.add_argument('--prune', action='store_true', help='skip dominated moves (own territory, dead regions)')
+    parser.add_argument('--diff_games', type=int, default=0, help='games for the average final territory difference (0=skip)')
+    parser.add_argument('--rollout', action='store_true', help='also play AZ vs pure MCTS with random playouts')
+    parser.add_argument('--rollout_sims', type=int, default=50, help='MCTS simulations for the rollout player')
+    parser.add_argument('--playouts', type=int, default=16, help='random playouts per MCTS leaf (rollout player)')
+    parser.add_argument('--leaf_batch', type=int, default=16, help='leaves evaluated together by the rollout player (1=sequential)')
     args = parser.parseArgs([]) if hasattr(parser, 'parseArgs') else parser.parse_args()
 
     # 게임 초기화
@@ -136,17 +125,20 @@ def main():
         g = Game()
 
     # AZ 플레이어 로드
-    az_player, nnet = make_az_player(g, sims=args.sims)
+    az_player, nnet = make_az_player(g, sims=args.sims, prune=args.prune)
     ckpt_path = os.path.join(args.ckpt_dir, args.ckpt)
     if os.path.isfile(ckpt_path):
         print(f'[Load] checkpoint: {ckpt_path}')
         nnet.load_checkpoint(args.ckpt_dir, args.ckpt)
     else:
         print(f'[Warn] checkpoint not found: {ckpt_path} (초기 가중치로 평가합니다)')
+    if args.int8:
+        rep = nnet.quantize()
+        print(f"[int8] policy KL={rep['policy_kl_mean']:.2e}, value MAE={rep['value_mae']:.2e}")
 
     # 베이스라인 플레이어들
-    rnd = RandomPlayer(g).play
-    grd = GreedyTerritoryPlayer(g).play
+    rnd = RandomPlayer(g, prune=args.prune).play
+    grd = GreedyTerritoryPlayer(g, prune=args.prune).play
 
     # 1) AZ vs Random
     arena = Arena(az_player, rnd, g)
@@ -158,10 +150,19 @@ def main():
     w2, l2, d2 = arena.playGames(args.games, verbose=False)
     print(f'[AZ vs Greedy] W/L/D = {w2}/{l2}/{d2}  (Win={w2/(w2+l2+d2):.3f})')
 
+    # 3) AZ vs MCTS-Rollout (네트워크 없는 순수 MCTS)
+    if args.rollout:
+        rol, rnet = rollout_mcts_player('mykingdom', g, sims=args.rollout_sims, playouts=args.playouts,
+                                         leaf_batch=args.leaf_batch)
+        arena = Arena(az_player, rol, g)
+        w3, l3, d3 = arena.playGames(args.games, verbose=False)
+        print(f'[AZ vs MCTS-Rollout] W/L/D = {w3}/{l3}/{d3}  (Win={w3/(w3+l3+d3):.3f})  '
+              f'{rnet.num_playouts} playouts, {rnet.playout_rate():,.0f} playouts/s')
+
     # (옵션) 평균 영토차
-    if SCORER is not None and hasattr(Arena, 'playSingleGame'):
-        # Arena에 playSingleGame(return_boards=True) 같은 편의가 없으면 이 블록은 생략해도 됨.
-        pass
+    if args.diff_games > 0:
+        diff = avg_territory_diff(g, args.diff_games, az_player, grd)
+        print(f'[AZ vs Greedy] 평균 영토차(흑-백) = {diff:.2f}  ({args.diff_games}판)')
 
 if __name__ == '__main__':
     main()
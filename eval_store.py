@@ -0,0 +1,199 @@
+"""
+SQLite store for evaluation results (replaces the append-only eval_log.csv).
+
+One row per eval run with typed columns; plots and queries select only the
+series they need through the indexes instead of re-parsing the whole log.
+
+    python eval_store.py import eval_log.csv          # one-time, safe to repeat
+    python eval_store.py show --vs greedy --board 6
+    python eval_store.py plot --board 6 --png eval_winrate.png
+"""
+import argparse
+import csv
+import datetime
+import hashlib
+import json
+import os
+import sqlite3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id        INTEGER PRIMARY KEY,
+    run_key   TEXT    NOT NULL UNIQUE,   -- hash of every other column, see run_key()
+    ts        TEXT    NOT NULL,      -- ISO timestamp, sorts chronologically
+    game      TEXT    NOT NULL,
+    board     INTEGER NOT NULL,
+    ckpt      TEXT    NOT NULL,      -- agent 1 checkpoint path
+    opponent  TEXT    NOT NULL,      -- random / greedy / self / ckpt2 / mcts_rollout
+    opp_ckpt  TEXT    NOT NULL DEFAULT '',
+    games     INTEGER NOT NULL,
+    sims      INTEGER NOT NULL,
+    cpuct     REAL    NOT NULL,
+    temp      REAL    NOT NULL,
+    endgame   INTEGER,               -- NULL: not recorded (imported rows)
+    int8      INTEGER,
+    playouts  INTEGER,
+    p1_wins   INTEGER NOT NULL,
+    p2_wins   INTEGER NOT NULL,
+    draws     INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_opponent ON runs (game, board, opponent, ts);
+CREATE INDEX IF NOT EXISTS runs_ckpt ON runs (ckpt, ts);
+"""
+
+COLUMNS = ("ts", "game", "board", "ckpt", "opponent", "opp_ckpt", "games", "sims", "cpuct", "temp",
+           "endgame", "int8", "playouts", "p1_wins", "p2_wins", "draws")
+FILTERS = ("game", "board", "ckpt", "opponent", "sims")
+
+
+def run_key(row):
+    """Identity of a run: all columns (timestamp, settings, outcome); NULL settings count as equal."""
+    blob = json.dumps([row.get(c) for c in COLUMNS], default=str)
+    return hashlib.sha1(blob.encode()).hexdigest()
+
+
+class EvalStore:
+    def __init__(self, path="eval_log.db"):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self._migrate()
+        self.conn.executescript(SCHEMA)
+
+    def _migrate(self):
+        """Stores written before run_key existed: rebuild the table with the new key."""
+        cols = [r[1] for r in self.conn.execute("PRAGMA table_info(runs)")]
+        if not cols or "run_key" in cols:
+            return
+        old = [dict(r) for r in self.conn.execute("SELECT * FROM runs ORDER BY id")]
+        with self.conn:
+            self.conn.execute("DROP TABLE runs")
+        self.conn.executescript(SCHEMA)
+        for r in old:
+            r.pop("id")
+            self.add(**r)
+
+    def close(self):
+        self.conn.close()
+
+    def add(self, **row):
+        """
+        Insert one run; `ts` defaults to now. Returns False when an identical run
+        (same timestamp, settings and outcome) is already stored.
+        """
+        row.setdefault("ts", datetime.datetime.now().isoformat(timespec="seconds"))
+        row.setdefault("game", "othello")
+        row.setdefault("opp_ckpt", "")
+        cols = ["run_key"] + [c for c in COLUMNS if c in row]
+        row["run_key"] = run_key(row)
+        with self.conn:
+            cur = self.conn.execute(
+                f"INSERT OR IGNORE INTO runs ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})",
+                [row[c] for c in cols])
+        return cur.rowcount > 0
+
+    def _where(self, filters):
+        keys = [k for k in FILTERS if filters.get(k) is not None]
+        clause = " AND ".join(f"{k} = ?" for k in keys)
+        return (" WHERE " + clause) if keys else "", [filters[k] for k in keys]
+
+    def runs(self, **filters):
+        """Matching rows (sqlite3.Row) in time order; filters: game, board, ckpt, opponent, sims."""
+        where, params = self._where(filters)
+        return self.conn.execute(f"SELECT * FROM runs{where} ORDER BY ts", params).fetchall()
+
+    def opponents(self, **filters):
+        where, params = self._where(filters)
+        return [r[0] for r in self.conn.execute(f"SELECT DISTINCT opponent FROM runs{where} ORDER BY opponent", params)]
+
+    def series(self, **filters):
+        """[(datetime, P1 win rate)] of the matching runs in time order."""
+        where, params = self._where(filters)
+        rows = self.conn.execute(
+            f"SELECT ts, CAST(p1_wins AS REAL) / MAX(p1_wins + p2_wins + draws, 1) FROM runs{where} ORDER BY ts",
+            params)
+        return [(datetime.datetime.fromisoformat(ts), wr) for ts, wr in rows]
+
+    def import_csv(self, csv_path, game="othello"):
+        """Load an old eval_log.csv; rows already present are skipped. Returns (added, skipped)."""
+        added = skipped = 0
+        with open(csv_path, "r", encoding="utf-8") as f:
+            for d in csv.DictReader(f):
+                try:
+                    ts = datetime.datetime.fromisoformat(d["datetime"])
+                except (KeyError, ValueError):
+                    skipped += 1
+                    continue
+                ok = self.add(
+                    ts=ts.isoformat(timespec="seconds"), game=game, board=int(d["board"]),
+                    ckpt=os.path.join(d["ckpt1_dir"], d["ckpt1_file"]), opponent=d["vs"],
+                    opp_ckpt=os.path.join(d["ckpt2_dir"], d["ckpt2_file"]) if d.get("ckpt2_file") else "",
+                    games=int(d["games"]), sims=int(d["sims"]), cpuct=float(d["cpuct"]), temp=float(d["temp"]),
+                    p1_wins=int(d["p1_wins"]), p2_wins=int(d["p2_wins"]), draws=int(d["draws"]))
+                added += ok
+                skipped += not ok
+        return added, skipped
+
+
+def plot_store(store, png_path, **filters):
+    """
+    P1 승률 변동을 상대(opponent)별 곡선으로 그려 png 저장.
+    filters(game/board/ckpt/sims)에 맞는 시리즈만 DB에서 읽는다.
+    """
+    import matplotlib.pyplot as plt
+
+    filters.pop("opponent", None)
+    names = store.opponents(**filters)
+    if not names:
+        print("[plot] No rows to plot.")
+        return
+
+    plt.figure(figsize=(9, 4.5))
+    for vs in names:
+        pts = store.series(opponent=vs, **filters)
+        plt.plot([p[0] for p in pts], [p[1] * 100.0 for p in pts], marker="o", label=vs)
+
+    plt.title(f"{(filters.get('game') or 'othello').capitalize()} Evaluation – P1 WinRate over time")
+    plt.xlabel("Run timestamp")
+    plt.ylabel("WinRate (%)")
+    plt.grid(True, alpha=0.3)
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig(png_path, dpi=150)
+    plt.close()
+    print(f"[plot] Saved: {png_path}")
+
+
+def main():
+    ap = argparse.ArgumentParser("Evaluation result store")
+    ap.add_argument("cmd", choices=["import", "show", "plot"])
+    ap.add_argument("csv", nargs="?", help="(import) old CSV log")
+    ap.add_argument("--db", type=str, default="eval_log.db")
+    ap.add_argument("--game", type=str, default=None)
+    ap.add_argument("--board", type=int, default=None)
+    ap.add_argument("--ckpt", type=str, default=None)
+    ap.add_argument("--vs", type=str, default=None)
+    ap.add_argument("--sims", type=int, default=None)
+    ap.add_argument("--png", type=str, default="eval_winrate.png")
+    args = ap.parse_args()
+
+    store = EvalStore(args.db)
+    filters = dict(game=args.game, board=args.board, ckpt=args.ckpt, opponent=args.vs, sims=args.sims)
+    if args.cmd == "import":
+        if not args.csv:
+            ap.error("import needs a CSV path")
+        added, skipped = store.import_csv(args.csv, game=args.game or "othello")
+        print(f"[import] {args.csv} -> {args.db}: {added} added, {skipped} skipped")
+    elif args.cmd == "show":
+        for r in store.runs(**filters):
+            total = max(r["p1_wins"] + r["p2_wins"] + r["draws"], 1)
+            print(f"{r['ts']}  {r['game']} {r['board']}x{r['board']}  {r['ckpt']}  vs {r['opponent']:<12} "
+                  f"sims={r['sims']:<4} W/L/D={r['p1_wins']}/{r['p2_wins']}/{r['draws']}  "
+                  f"{r['p1_wins'] / total * 100:.1f}%")
+    else:
+        plot_store(store, args.png, **filters)
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,20 @@
 # games/mykingdom/MyKingdomGame.py
 import numpy as np
-from .scorer import EMPTY, BLACK, WHITE, winner_by_plus3_rule
+from base_env import GameState
+from zobrist import ZobristTable
+from .scorer import EMPTY, BLACK, WHITE, territory_map, winner_by_plus3_rule
+from .territory import dominated_moves
 
 class MyKingdomGame:
 
     def __init__(self, N=9):
         self.N = N
         self.PASS = self.N * self.N
+        self.zobrist = ZobristTable(self.N * self.N, seed=1000 + self.N)
 
     # ---- basic sizes ----
     def getInitBoard(self):
-        return np.zeros((self.N, self.N), dtype=int)
+        return np.zeros((self.N, self.N), dtype=np.int8)
 
     def getBoardSize(self):
         return (self.N, self.N)
@@ -33,13 +37,21 @@ class MyKingdomGame:
     def getValidMoves(self, board, player):
 
         valid = np.zeros(self.getActionSize(), dtype=int)
-        for r in range(self.N):
-            for c in range(self.N):
-                if board[r, c] == EMPTY:
-                    valid[r * self.N + c] = 1
-        valid[self.PASS] = 0  # PASS always allowed
+        valid[:self.PASS] = board.reshape(-1) == EMPTY
+        valid[self.PASS] = 0  # PASS is never valid
         return valid
 
+    def getPrunedMoves(self, board, player, valids=None):
+        """
+        Valid moves minus dominated ones (own territory, dead neutral regions).
+        Falls back to the full valid set when nothing would be left.
+        """
+        if valids is None:
+            valids = self.getValidMoves(board, player)
+        pruned = valids.copy()
+        pruned[:self.PASS][dominated_moves(board, player)] = 0
+        return pruned if pruned.any() else valids
+
     # ---- termination & result ----
     def getGameEnded(self, board, player):
 
@@ -51,12 +63,76 @@ class MyKingdomGame:
     # ---- canonicalization & symmetries (needed by AZ-G) ----
     def getCanonicalForm(self, board, player):
 
-        return board * player
+        return board * np.int8(player)
 
     def getSymmetries(self, board, pi):
- 
-        return [(board, pi)]
+        # 영토 규칙은 회전/반전에 불변 -> 정사각형 보드의 8가지 대칭 (PASS 확률은 그대로)
+        assert len(pi) == self.N ** 2 + 1
+        pi_grid = np.reshape(pi[:-1], (self.N, self.N))
+        out = []
+
+        for k in range(1, 5):                  # 90/180/270/360 회전
+            for flip_lr in (True, False):      # 좌우 반전 유무
+                b2 = np.rot90(board, k)
+                p2 = np.rot90(pi_grid, k)
+                if flip_lr:
+                    b2 = np.fliplr(b2)
+                    p2 = np.fliplr(p2)
+                out.append((b2, list(p2.ravel()) + [pi[-1]]))
+        return out
+
+    def getOwnershipTarget(self, board):
+        """
+        Per-cell owner of a final board (BLACK/WHITE/0): stones plus territory_map.
+        A finished board is full, so in practice this is the stone layout itself.
+        """
+        return (board + territory_map(board)).astype(np.int8)
 
     def stringRepresentation(self, board):
         # bytes representation for caching in MCTS
         return board.tobytes()
+
+    def hashKey(self, board):
+        # 64-bit Zobrist hash used as the MCTS key (updated incrementally by MyKingdomState)
+        return self.zobrist.hash(board)
+
+    def makeState(self, board, player=1):
+        return MyKingdomState(self, board, player)
+
+
+class MyKingdomState(GameState):
+    """GameState whose empty-cell mask is shared by valids and the full-board check."""
+
+    def __init__(self, game, board, player=1, hashes=None):
+        super().__init__(game, board, player, hashes)
+        self._empty = None
+
+    @property
+    def empty(self):
+        if self._empty is None:
+            self._empty = self.board.reshape(-1) == EMPTY
+        return self._empty
+
+    @property
+    def valids(self):
+        if self._valids is None:
+            valid = np.zeros(self.game.getActionSize(), dtype=int)
+            valid[:self.game.PASS] = self.empty
+            self._valids = valid
+        return self._valids
+
+    @property
+    def ended(self):
+        if self._ended is None:
+            if self.empty.any():
+                self._ended = 0
+            else:
+                self._ended = 1 if winner_by_plus3_rule(self.board) == self.player else -1
+        return self._ended
+
+    def _successor(self, action):
+        board, player = self.game.getNextState(self.board, self.player, action)
+        hashes = self._hashes
+        if hashes is not None and action != self.game.PASS:
+            hashes = self.game.zobrist.place(hashes, self.player, int(action))
+        return MyKingdomState(self.game, board, player, hashes)
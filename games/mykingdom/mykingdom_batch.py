@@ -0,0 +1,73 @@
+# games/mykingdom/mykingdom_batch.py
+import numpy as np
+
+from .scorer import EMPTY, BLACK, score_territory_batch
+
+
+class MyKingdomBatchEnv:
+    """
+    MyKingdom rules for a stack of boards at once.
+    boards: (B, N, N) array in {1, -1, 0}; players: (B,) array (or scalar) of +-1.
+    Results follow MyKingdomGame exactly (same action indexing, PASS = N*N is never
+    valid, a game ends when the board is full and is decided by the +3 rule),
+    only vectorised over B.
+    """
+
+    def __init__(self, N=9):
+        self.N = N
+        self.PASS = N * N
+
+    def _players(self, boards, players):
+        return np.broadcast_to(np.asarray(players), (len(boards),))
+
+    # --- Game API, batched ---
+
+    def valid_moves(self, boards, players=1):
+        """(B, N*N+1) int masks: every empty cell; PASS stays 0."""
+        mask = np.zeros((len(boards), self.PASS + 1), dtype=int)
+        mask[:, :-1] = boards.reshape(len(boards), -1) == EMPTY
+        return mask
+
+    def step(self, boards, players, actions):
+        """Play actions[i] on boards[i] for player players[i]; returns (next_boards, -players)."""
+        players = self._players(boards, players)
+        actions = np.asarray(actions)
+        nxt = boards.copy()
+        flat = nxt.reshape(len(boards), -1)
+        rows = np.flatnonzero(actions != self.PASS)
+        assert (flat[rows, actions[rows]] == EMPTY).all(), "cell not empty"
+        flat[rows, actions[rows]] = players[rows]
+        return nxt, -players
+
+    def scores(self, boards, players=1):
+        """(B,) territory difference (own - opponent) from `players`' point of view."""
+        black, white = score_territory_batch(boards)[:2]
+        return (black - white) * self._players(boards, players)
+
+    def game_ended(self, boards, players):
+        """(B,) like MyKingdomGame.getGameEnded: 0 until the board is full, else +-1 for `players`."""
+        players = self._players(boards, players)
+        full = ~(boards == EMPTY).any(axis=(1, 2))
+        out = np.zeros(len(boards), dtype=int)
+        if full.any():
+            black, white = score_territory_batch(boards[full])[:2]
+            win = np.where(black - white >= 3, BLACK, -BLACK)
+            out[full] = np.where(win == players[full], 1, -1)
+        return out
+
+    def random_playouts(self, boards, players, rng):
+        """
+        Finish every board with uniformly random moves; returns (B,) results like
+        game_ended for `players`. Moves never interact, so a playout is just a
+        random order of the empty cells, filled alternately starting with `players`.
+        """
+        players = self._players(boards, players)
+        flat = boards.reshape(len(boards), -1)
+        empty = flat == EMPTY
+        rank = np.where(empty, rng.rand(*flat.shape), 2.0).argsort(axis=1).argsort(axis=1)
+        color = np.where(rank % 2 == 0, players[:, None], -players[:, None])
+        final = np.where(empty, color, flat).astype(boards.dtype).reshape(boards.shape)
+        return self.game_ended(final, players)
+
+    def canonical(self, boards, players):
+        return boards * self._players(boards, players).astype(boards.dtype)[:, None, None]
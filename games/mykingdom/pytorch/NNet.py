@@ -8,6 +8,7 @@ from tqdm import tqdm
 sys.path.append('../../')
 from utils import *
 from network_wrap import NeuralNet
+from inference_engine import InferenceEngine, compare_predictions, sample_positions
 
 import torch
 import torch.optim as optim
@@ -21,6 +22,10 @@ args = dotdict({
     'batch_size': 64,
     'cuda': torch.cuda.is_available(),
     'num_channels': 512,
+    'fast_inference': True,   # folded-BN TorchScript engine for predict()
+    'int8_inference': False,  # int8 engine on CPU (see NNetWrapper.quantize); training stays float
+    'ownership_head': False,  # auxiliary per-cell ownership head, trained on 4-tuple examples
+    'ownership_weight': 1.0,
 })
 
 
@@ -29,6 +34,10 @@ class NNetWrapper(NeuralNet):
         self.nnet = onnet(game, args)
         self.board_x, self.board_y = game.getBoardSize()
         self.action_size = game.getActionSize()
+        self.game = game
+        self._engine = None
+        self._int8 = args.int8_inference
+        self._calib = None
 
         if args.cuda:
             self.nnet.cuda()
@@ -36,6 +45,7 @@ class NNetWrapper(NeuralNet):
     def train(self, examples):
         """
         examples: list of examples, each example is of form (board, pi, v)
+                  or (board, pi, v, ownership); the two forms may be mixed
         """
         optimizer = optim.Adam(self.nnet.parameters())
 
@@ -44,14 +54,16 @@ class NNetWrapper(NeuralNet):
             self.nnet.train()
             pi_losses = AverageMeter()
             v_losses = AverageMeter()
+            own_losses = AverageMeter()
 
             batch_count = int(len(examples) / args.batch_size)
 
             t = tqdm(range(batch_count), desc='Training Net')
             for _ in t:
                 sample_ids = np.random.randint(len(examples), size=args.batch_size)
-                boards, pis, vs = list(zip(*[examples[i] for i in sample_ids]))
-                boards = torch.FloatTensor(np.array(boards).astype(np.float64))
+                batch = [examples[i] for i in sample_ids]
+                boards, pis, vs = list(zip(*[ex[:3] for ex in batch]))
+                boards = torch.from_numpy(np.array(boards, dtype=np.float32))
                 target_pis = torch.FloatTensor(np.array(pis))
                 target_vs = torch.FloatTensor(np.array(vs).astype(np.float64))
 
@@ -60,25 +72,48 @@ class NNetWrapper(NeuralNet):
                     boards, target_pis, target_vs = boards.contiguous().cuda(), target_pis.contiguous().cuda(), target_vs.contiguous().cuda()
 
                 # compute output
-                out_pi, out_v = self.nnet(boards)
+                use_own = args.ownership_head and any(len(ex) > 3 for ex in batch)
+                if use_own:
+                    out_pi, out_v, out_own = self.nnet(boards, ownership=True)
+                else:
+                    out_pi, out_v = self.nnet(boards)
                 l_pi = self.loss_pi(target_pis, out_pi)
                 l_v = self.loss_v(target_vs, out_v)
                 total_loss = l_pi + l_v
 
+                if use_own:
+                    # 3-tuple examples (no ownership stored) are masked out of the aux loss
+                    blank = np.zeros((self.board_x, self.board_y), dtype=np.float32)
+                    target_own = torch.from_numpy(np.array([ex[3] if len(ex) > 3 else blank for ex in batch], dtype=np.float32))
+                    mask = torch.FloatTensor([float(len(ex) > 3) for ex in batch])
+                    if args.cuda:
+                        target_own, mask = target_own.contiguous().cuda(), mask.contiguous().cuda()
+                    l_own = self.loss_own(target_own, out_own, mask)
+                    total_loss = total_loss + args.ownership_weight * l_own
+                    own_losses.update(l_own.item(), int(mask.sum().item()))
+
                 # record loss
                 pi_losses.update(l_pi.item(), boards.size(0))
                 v_losses.update(l_v.item(), boards.size(0))
-                t.set_postfix(Loss_pi=pi_losses, Loss_v=v_losses)
+                if args.ownership_head:
+                    t.set_postfix(Loss_pi=pi_losses, Loss_v=v_losses, Loss_own=own_losses)
+                else:
+                    t.set_postfix(Loss_pi=pi_losses, Loss_v=v_losses)
 
                 # compute gradient and do SGD step
                 optimizer.zero_grad()
                 total_loss.backward()
                 optimizer.step()
 
+        self._engine = None
+
     def predict(self, board):
         """
         board: np array with board
         """
+        if args.fast_inference or self._int8:
+            return self.inference_engine().predict(board)
+
         # timing
         start = time.time()
 
@@ -93,12 +128,59 @@ class NNetWrapper(NeuralNet):
         # print('PREDICTION TIME TAKEN : {0:03f}'.format(time.time()-start))
         return torch.exp(pi).data.cpu().numpy()[0], v.data.cpu().numpy()[0]
 
+    def predict_batch(self, boards):
+        """
+        boards: (N, board_x, board_y) np array
+        returns: (N, action_size) policies, (N,) values
+        """
+        if args.fast_inference or self._int8:
+            return self.inference_engine().predict_batch(boards)
+
+        boards = torch.FloatTensor(np.asarray(boards, dtype=np.float32))
+        if args.cuda: boards = boards.contiguous().cuda()
+        boards = boards.view(-1, self.board_x, self.board_y)
+        self.nnet.eval()
+        with torch.no_grad():
+            pi, v = self.nnet(boards)
+        return torch.exp(pi).data.cpu().numpy(), v.data.cpu().numpy().reshape(-1)
+
+    def inference_engine(self):
+        """Inference-only copy of the net, rebuilt when the weights changed."""
+        if self._engine is None or self._engine.is_stale():
+            self.nnet.eval()
+            self._engine = InferenceEngine(self.nnet, int8=self._int8, calib_boards=self._calib)
+        return self._engine
+
+    def quantize(self, num_positions=256, seed=0):
+        """
+        Switch MCTS inference to an int8 CPU engine and report its accuracy
+        against the float engine on random positions. self.nnet stays float.
+        """
+        boards = sample_positions(self.game, num_positions, seed)
+        self.nnet.eval()
+        ref = InferenceEngine(self.nnet)
+        self._int8, self._calib = True, boards
+        self._engine = None
+        return compare_predictions(ref, self.inference_engine(), boards)
+
     def loss_pi(self, targets, outputs):
         return -torch.sum(targets * outputs) / targets.size()[0]
 
     def loss_v(self, targets, outputs):
         return torch.sum((targets - outputs.view(-1)) ** 2) / targets.size()[0]
 
+    def loss_own(self, targets, outputs, mask):
+        # per-cell squared error, averaged over cells and over the examples that carry a target
+        per_example = torch.mean((targets - outputs) ** 2, dim=(1, 2))
+        return torch.sum(per_example * mask) / torch.clamp(mask.sum(), min=1.0)
+
+    def get_weights(self):
+        return {k: v.detach().cpu().clone() for k, v in self.nnet.state_dict().items()}
+
+    def set_weights(self, state):
+        self.nnet.load_state_dict(state)
+        self._engine = None
+
     def save_checkpoint(self, folder='checkpoint', filename='checkpoint.pth.tar'):
         filepath = os.path.join(folder, filename)
         if not os.path.exists(folder):
@@ -117,4 +199,9 @@ class NNetWrapper(NeuralNet):
             raise ("No model in path {}".format(filepath))
         map_location = None if args.cuda else 'cpu'
         checkpoint = torch.load(filepath, map_location=map_location)
-        self.nnet.load_state_dict(checkpoint['state_dict'])
+        # checkpoints with / without the optional ownership head load into either net
+        missing, unexpected = self.nnet.load_state_dict(checkpoint['state_dict'], strict=False)
+        bad = [k for k in list(missing) + list(unexpected) if not k.startswith('own_')]
+        if bad:
+            raise RuntimeError("state_dict mismatch in {}: {}".format(filepath, bad))
+        self._engine = None
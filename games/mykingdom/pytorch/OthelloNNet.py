@@ -36,11 +36,17 @@ class OthelloNNet(nn.Module):
 
         self.fc4 = nn.Linear(512, 1)
 
-    def forward(self, s):
+        # optional per-cell ownership head (auxiliary target, see NNetWrapper.train)
+        self.ownership_head = args.ownership_head
+        if self.ownership_head:
+            self.own_conv = nn.Conv2d(args.num_channels, 1, 1)
+
+    def forward(self, s, ownership=False):
         #                                                           s: batch_size x board_x x board_y
         s = s.view(-1, 1, self.board_x, self.board_y)                # batch_size x 1 x board_x x board_y
         s = F.relu(self.bn1(self.conv1(s)))                          # batch_size x num_channels x board_x x board_y
         s = F.relu(self.bn2(self.conv2(s)))                          # batch_size x num_channels x board_x x board_y
+        trunk = s
         s = F.relu(self.bn3(self.conv3(s)))                          # batch_size x num_channels x (board_x-2) x (board_y-2)
         s = F.relu(self.bn4(self.conv4(s)))                          # batch_size x num_channels x (board_x-4) x (board_y-4)
         s = s.view(-1, self.args.num_channels*(self.board_x-4)*(self.board_y-4))
@@ -51,4 +57,7 @@ class OthelloNNet(nn.Module):
         pi = self.fc3(s)                                                                         # batch_size x action_size
         v = self.fc4(s)                                                                          # batch_size x 1
 
+        if ownership:
+            own = torch.tanh(self.own_conv(trunk)).view(-1, self.board_x, self.board_y)  # batch_size x board_x x board_y
+            return F.log_softmax(pi, dim=1), torch.tanh(v), own
         return F.log_softmax(pi, dim=1), torch.tanh(v)
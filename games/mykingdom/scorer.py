@@ -15,6 +15,8 @@ __all__ = [
     "EMPTY", "BLACK", "WHITE",
     "score_territory",
     "winner_by_plus3_rule",
+    "territory_map",
+    "score_territory_batch",
 ]
 
 def score_territory(board: np.ndarray):
@@ -139,4 +141,88 @@ def territory_map(board: np.ndarray) -> np.ndarray:
 
     # 돌이 놓인 칸은 0
     tmap[board != EMPTY] = 0
-    return tmap
\ No newline at end of file
+    return tmap
+
+
+def _neighbor_any(mask: np.ndarray) -> np.ndarray:
+    """(B, N, N) bool -> cells with at least one 4-neighbor set in mask."""
+    out = np.zeros_like(mask)
+    out[:, 1:, :] |= mask[:, :-1, :]
+    out[:, :-1, :] |= mask[:, 1:, :]
+    out[:, :, 1:] |= mask[:, :, :-1]
+    out[:, :, :-1] |= mask[:, :, 1:]
+    return out
+
+
+def _label_regions(boards: np.ndarray) -> np.ndarray:
+    """
+    (B, N, N) -> region label per cell: the flat index of one cell of the same
+    empty region, B*N*N for stones.
+    """
+    B, N, _ = boards.shape
+    empty = boards == EMPTY
+    # 빈칸마다 자기 flat index로 시작 -> 이웃 최소값 전파 + pointer jumping으로 수렴.
+    # 라벨은 항상 같은 영역 안의 칸 번호이므로 lab[lab]도 같은 영역의 라벨이다.
+    none = B * N * N
+    lab = np.where(empty, np.arange(none).reshape(B, N, N), none)
+    active = np.arange(B)                     # 아직 라벨이 바뀌는 보드만 계속 갱신
+    while len(active):
+        cur = lab[active]
+        new = cur.copy()
+        np.minimum(new[:, 1:, :], cur[:, :-1, :], out=new[:, 1:, :])
+        np.minimum(new[:, :-1, :], cur[:, 1:, :], out=new[:, :-1, :])
+        np.minimum(new[:, :, 1:], cur[:, :, :-1], out=new[:, :, 1:])
+        np.minimum(new[:, :, :-1], cur[:, :, 1:], out=new[:, :, :-1])
+        new[~empty[active]] = none
+        lab[active] = new
+        flat = np.append(lab.reshape(-1), none)
+        new = flat[flat[new]]
+        lab[active] = new
+        active = active[(new != cur).any(axis=(1, 2))]
+    return lab
+
+
+def score_territory_batch(boards: np.ndarray, edge_neutral: bool = True):
+    """
+    Territory of many boards at once (array connected-component labeling).
+
+    Parameters
+    ----------
+    boards : np.ndarray of shape (B, N, N) or (N, N)
+        Values must be in {BLACK=1, WHITE=-1, EMPTY=0}.
+    edge_neutral : bool
+        True  -> regions touching the edge are neutral (score_territory).
+        False -> the edge is a plain wall (territory_map).
+
+    Returns
+    -------
+    (black_terr, white_terr, ownership)
+        (B,) int arrays and a (B, N, N) int map in {BLACK, WHITE, 0};
+        occupied points are 0. For a single (N, N) board the batch axis is dropped.
+    """
+    boards = np.asarray(boards)
+    single = boards.ndim == 2
+    if single:
+        boards = boards[None]
+    B, N, _ = boards.shape
+    empty = boards == EMPTY
+    lab = _label_regions(boards)
+    none = B * N * N
+
+    ids = lab[empty]
+    adj_b = np.bincount(ids, weights=_neighbor_any(boards == BLACK)[empty], minlength=none + 1) > 0
+    adj_w = np.bincount(ids, weights=_neighbor_any(boards == WHITE)[empty], minlength=none + 1) > 0
+    owner = np.where(adj_b & ~adj_w, BLACK, np.where(adj_w & ~adj_b, WHITE, 0))
+    if edge_neutral:
+        edge = np.zeros((N, N), dtype=bool)
+        edge[[0, -1], :] = edge[:, [0, -1]] = True
+        on_edge = np.bincount(ids, weights=np.broadcast_to(edge, empty.shape)[empty], minlength=none + 1) > 0
+        owner[on_edge] = 0
+    owner[none] = 0
+
+    ownership = owner[lab]
+    black = (ownership == BLACK).sum(axis=(1, 2))
+    white = (ownership == WHITE).sum(axis=(1, 2))
+    if single:
+        return int(black[0]), int(white[0]), ownership[0]
+    return black, white, ownership
@@ -0,0 +1,243 @@
+# territory.py
+# Incremental territory bookkeeping for MyKingdom (same rule as scorer.score_territory):
+# - an EMPTY region counts for a color only if it is bordered by that color alone
+#   and does not touch the board edge.
+#
+# Stones are never removed, so placing a stone can only split the empty region it
+# lands in. The tracker labels regions once (union-find) and afterwards re-labels
+# only the region that received the stone. score_if_played() evaluates every empty
+# point at once with one articulation-point DFS per region.
+# dominated_moves() marks empty points where a move cannot help the mover under that rule.
+
+import numpy as np
+
+from .scorer import EMPTY, BLACK, WHITE, score_territory_batch, _label_regions, _neighbor_any
+
+__all__ = ["TerritoryTracker", "dominated_moves"]
+
+
+def dominated_moves(board: np.ndarray, color: int) -> np.ndarray:
+    """
+    (N*N,) bool mask of empty points where `color` gains nothing by playing:
+
+    - its own territory: every piece of the region stays bordered by `color`
+      alone and off the edge, so the move only costs one point;
+    - dead neutral regions where every point is on the edge or touches both
+      colors: every piece left by any move is still neutral.
+    """
+    boards = np.asarray(board)[None]
+    empty = boards == EMPTY
+    own = score_territory_batch(boards)[2] == color
+
+    edge = np.zeros(empty.shape[1:], dtype=bool)
+    edge[[0, -1], :] = edge[:, [0, -1]] = True
+    dead = edge | (_neighbor_any(boards == BLACK) & _neighbor_any(boards == WHITE))
+    lab = _label_regions(boards)
+    alive = np.bincount(lab[empty], weights=~dead[empty], minlength=boards.size + 1) > 0
+    return (empty & (own | ~alive[lab])).reshape(-1)
+
+
+class TerritoryTracker:
+    """
+    Parameters
+    ----------
+    board : np.ndarray of shape (N, N)
+        Starting position, values in {BLACK=1, WHITE=-1, EMPTY=0}. Copied.
+    """
+
+    def __init__(self, board: np.ndarray):
+        self.N = N = board.shape[0]
+        self.board = np.asarray(board).reshape(-1).copy()
+        self.nbrs = []
+        self.edge = np.zeros(N * N, dtype=bool)
+        for i in range(N * N):
+            r, c = divmod(i, N)
+            nb = []
+            if r > 0:     nb.append(i - N)
+            if r < N - 1: nb.append(i + N)
+            if c > 0:     nb.append(i - 1)
+            if c < N - 1: nb.append(i + 1)
+            self.nbrs.append(nb)
+            self.edge[i] = r == 0 or r == N - 1 or c == 0 or c == N - 1
+
+        self.label = np.full(N * N, -1, dtype=int)
+        self.regions = {}        # id -> {'cells', 'colors', 'edge', 'owner'}
+        self.black = self.white = 0
+        self._next_id = 0
+        self._build()
+
+    # ---- region bookkeeping ----
+
+    def _build(self):
+        parent = list(range(self.N * self.N))
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        empties = np.flatnonzero(self.board == EMPTY)
+        for i in empties:
+            for j in self.nbrs[i]:
+                if j > i and self.board[j] == EMPTY:
+                    ri, rj = find(i), find(j)
+                    if ri != rj:
+                        parent[rj] = ri
+        groups = {}
+        for i in empties:
+            groups.setdefault(find(i), []).append(int(i))
+        for cells in groups.values():
+            self._add_region(cells)
+
+    def _add_region(self, cells):
+        board = self.board
+        colors = set()
+        edge = False
+        for i in cells:
+            edge = edge or self.edge[i]
+            for j in self.nbrs[i]:
+                if board[j] != EMPTY:
+                    colors.add(int(board[j]))
+        owner = EMPTY
+        if not edge and colors == {BLACK}:
+            owner = BLACK
+        elif not edge and colors == {WHITE}:
+            owner = WHITE
+        rid = self._next_id
+        self._next_id += 1
+        self.regions[rid] = {"cells": cells, "colors": colors, "edge": edge, "owner": owner}
+        self.label[cells] = rid
+        self._credit(owner, len(cells))
+
+    def _credit(self, owner, size):
+        if owner == BLACK:
+            self.black += size
+        elif owner == WHITE:
+            self.white += size
+
+    def _flood(self, start, allowed):
+        out = [start]
+        allowed.discard(start)
+        k = 0
+        while k < len(out):
+            for j in self.nbrs[out[k]]:
+                if j in allowed:
+                    allowed.discard(j)
+                    out.append(j)
+            k += 1
+        return out
+
+    # ---- updates & queries ----
+
+    def place(self, cell, color):
+        """Put a stone of `color` on the empty flat index `cell` (= action)."""
+        assert self.board[cell] == EMPTY, f"cell {cell} is not empty"
+        rid = int(self.label[cell])
+        reg = self.regions.pop(rid)
+        self._credit(reg["owner"], -len(reg["cells"]))
+        self.board[cell] = color
+        self.label[cell] = -1
+        rest = set(reg["cells"])
+        rest.discard(cell)
+        while rest:
+            self._add_region(self._flood(next(iter(rest)), rest))
+
+    def score(self):
+        """(black_terr, white_terr) of the current board, same as score_territory."""
+        return self.black, self.white
+
+    def score_if_played(self, color):
+        """
+        Score after `color` plays at each point, for all points at once.
+
+        Returns
+        -------
+        (black, white) : tuple of np.ndarray of shape (N*N,)
+            Territory after the move; -1 at occupied points.
+        """
+        black = np.full(self.N * self.N, -1, dtype=int)
+        white = np.full(self.N * self.N, -1, dtype=int)
+        for reg in self.regions.values():
+            b_base, w_base = self.black, self.white
+            if reg["owner"] == BLACK:
+                b_base -= len(reg["cells"])
+            elif reg["owner"] == WHITE:
+                w_base -= len(reg["cells"])
+            for cell, (db, dw) in self._region_deltas(reg["cells"], color):
+                black[cell] = b_base + db
+                white[cell] = w_base + dw
+        return black, white
+
+    def _region_deltas(self, cells, color):
+        """
+        For each point p of one region: territory of the pieces of region - {p}
+        once p holds `color`. Sub-regions are the DFS subtrees cut off at p
+        (articulation points) plus the remainder; their size / edge / border
+        counts are subtree sums, so one DFS covers every p.
+        """
+        board, nbrs = self.board, self.nbrs
+        # per-cell [size, black incidences, white incidences, edge cells]
+        own = {}
+        for i in cells:
+            nb_b = nb_w = 0
+            for j in nbrs[i]:
+                v = board[j]
+                if v == BLACK:
+                    nb_b += 1
+                elif v == WHITE:
+                    nb_w += 1
+            own[i] = (1, nb_b, nb_w, int(self.edge[i]))
+
+        root = cells[0]
+        disc, low, agg, children = {root: 0}, {root: 0}, {root: list(own[root])}, {root: []}
+        stack = [(root, -1, iter(nbrs[root]))]
+        timer = 1
+        while stack:
+            u, par, it = stack[-1]
+            for v in it:
+                if board[v] != EMPTY:
+                    continue
+                if v not in disc:
+                    disc[v] = low[v] = timer
+                    timer += 1
+                    agg[v] = list(own[v])
+                    children[v] = []
+                    children[u].append(v)
+                    stack.append((v, u, iter(nbrs[v])))
+                    break
+                if v != par and disc[v] < low[u]:
+                    low[u] = disc[v]
+            else:
+                stack.pop()
+                if par != -1:
+                    if low[u] < low[par]:
+                        low[par] = low[u]
+                    a, b = agg[par], agg[u]
+                    for k in range(4):
+                        a[k] += b[k]
+
+        total = agg[root]
+        has_b0, has_w0 = color == BLACK, color == WHITE
+        for p in cells:
+            comps = []
+            sep = [0, 0, 0, 0]
+            for ch in children[p]:
+                if p == root or low[ch] >= disc[p]:
+                    comps.append(agg[ch])
+                    for k in range(4):
+                        sep[k] += agg[ch][k]
+            if p != root:
+                rest = [total[k] - own[p][k] - sep[k] for k in range(4)]
+                if rest[0] > 0:
+                    comps.append(rest)
+            db = dw = 0
+            for size, nb_b, nb_w, edge in comps:
+                if edge:
+                    continue
+                has_b, has_w = has_b0 or nb_b > 0, has_w0 or nb_w > 0
+                if has_b and not has_w:
+                    db += size
+                elif has_w and not has_b:
+                    dw += size
+            yield p, (db, dw)
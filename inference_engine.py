@@ -0,0 +1,173 @@
+import copy
+import warnings
+
+import numpy as np
+import torch
+import torch.ao.quantization as tq
+import torch.nn as nn
+import torch.nn.functional as F
+from torch.ao.quantization import DeQuantStub, QuantStub
+
+
+def fold_bn(layer, bn):
+    """Return a copy of a Conv2d/Linear layer with the following BatchNorm folded in."""
+    scale = bn.weight.detach() / torch.sqrt(bn.running_var.detach() + bn.eps)
+    shift = bn.bias.detach() - bn.running_mean.detach() * scale
+
+    if isinstance(layer, nn.Conv2d):
+        fused = nn.Conv2d(layer.in_channels, layer.out_channels, layer.kernel_size,
+                          stride=layer.stride, padding=layer.padding, bias=True)
+        w_scale = scale.view(-1, 1, 1, 1)
+    else:
+        fused = nn.Linear(layer.in_features, layer.out_features, bias=True)
+        w_scale = scale.view(-1, 1)
+
+    bias = layer.bias.detach() if layer.bias is not None else torch.zeros_like(shift)
+    with torch.no_grad():
+        fused.weight.copy_(layer.weight.detach() * w_scale)
+        fused.bias.copy_(bias * scale + shift)
+    return fused.to(layer.weight.device)
+
+
+class FoldedNet(nn.Module):
+    """
+    Inference-only twin of OthelloNNet: BatchNorm folded into conv/fc, no dropout,
+    softmax instead of log_softmax (predict wants probabilities anyway).
+    The quant stubs are identities unless the net goes through quantize_int8().
+    """
+
+    def __init__(self, net):
+        super(FoldedNet, self).__init__()
+        self.board_x, self.board_y = net.board_x, net.board_y
+        self.flat = net.args.num_channels * (net.board_x - 4) * (net.board_y - 4)
+
+        self.quant = QuantStub()
+        self.features = nn.Sequential(
+            fold_bn(net.conv1, net.bn1), nn.ReLU(),
+            fold_bn(net.conv2, net.bn2), nn.ReLU(),
+            fold_bn(net.conv3, net.bn3), nn.ReLU(),
+            fold_bn(net.conv4, net.bn4), nn.ReLU(),
+        )
+        self.dequant = DeQuantStub()
+        self.fc1 = fold_bn(net.fc1, net.fc_bn1)
+        self.fc2 = fold_bn(net.fc2, net.fc_bn2)
+        self.fc3 = nn.Linear(net.fc3.in_features, net.fc3.out_features).to(net.fc3.weight.device)
+        self.fc4 = nn.Linear(net.fc4.in_features, net.fc4.out_features).to(net.fc4.weight.device)
+        self.fc3.load_state_dict(net.fc3.state_dict())
+        self.fc4.load_state_dict(net.fc4.state_dict())
+        self.eval()
+
+    def forward(self, s):
+        s = s.view(-1, 1, self.board_x, self.board_y)
+        s = self.dequant(self.features(self.quant(s)))
+        s = s.reshape(-1, self.flat)
+        s = F.relu(self.fc1(s))
+        s = F.relu(self.fc2(s))
+        return F.softmax(self.fc3(s), dim=1), torch.tanh(self.fc4(s))
+
+
+def quantize_int8(folded, calib_boards=None):
+    """
+    CPU int8 copy of a FoldedNet. The fc layers are always dynamically quantized;
+    with calibration boards the conv stack is statically quantized as well
+    (dynamic quantization has no conv kernels).
+    """
+    q = copy.deepcopy(folded).cpu().eval()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        if calib_boards is not None and len(calib_boards) > 0:
+            qconfig = tq.get_default_qconfig(torch.backends.quantized.engine)
+            tq.fuse_modules(q.features, [["0", "1"], ["2", "3"], ["4", "5"], ["6", "7"]], inplace=True)
+            q.quant.qconfig = qconfig
+            q.features.qconfig = qconfig
+            q.dequant.qconfig = qconfig
+            tq.prepare(q, inplace=True)
+            with torch.no_grad():
+                q(torch.from_numpy(np.asarray(calib_boards, dtype=np.float32)))
+            tq.convert(q, inplace=True)
+        q = tq.quantize_dynamic(q, {nn.Linear}, dtype=torch.qint8)
+    return q
+
+
+def weights_version(tensors):
+    # in-place writes (optimizer.step, load_state_dict, BN running stats) bump _version
+    return sum(t._version for t in tensors)
+
+
+class InferenceEngine:
+    """
+    Frozen TorchScript copy of a network for MCTS.
+    Rebuilt by the owner whenever `is_stale()` reports that the source weights changed.
+    """
+
+    def __init__(self, net, script=True, int8=False, calib_boards=None):
+        self.source = net
+        self._tensors = list(net.parameters()) + list(net.buffers())
+        self.version = weights_version(self._tensors)
+        self.device = next(net.parameters()).device
+        self.board_x, self.board_y = net.board_x, net.board_y
+
+        module = FoldedNet(net)
+        self.int8 = int8 and self.device.type == "cpu"
+        if self.int8:
+            module = quantize_int8(module, calib_boards)
+        self._buf = torch.zeros(1, self.board_x, self.board_y, device=self.device)
+        self.module = self._script(module) if script else module
+
+    def _script(self, module):
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                traced = torch.jit.trace(module, self._buf, check_trace=False)
+                return torch.jit.freeze(traced)
+        except Exception:
+            return module
+
+    def is_stale(self):
+        return weights_version(self._tensors) != self.version
+
+    def predict(self, board):
+        self._buf[0].copy_(torch.from_numpy(np.ascontiguousarray(board)))
+        with torch.inference_mode():
+            pi, v = self.module(self._buf)
+        return pi.cpu().numpy()[0], v.cpu().numpy()[0]
+
+    def predict_batch(self, boards):
+        x = torch.from_numpy(np.asarray(boards, dtype=np.float32)).to(self.device)
+        with torch.inference_mode():
+            pi, v = self.module(x)
+        return pi.cpu().numpy(), v.cpu().numpy().reshape(-1)
+
+
+def sample_positions(game, num, seed=0):
+    """Canonical boards from uniformly random play, for calibration / accuracy checks."""
+    rng = np.random.RandomState(seed)
+    boards = []
+    while len(boards) < num:
+        board, cur = game.getInitBoard(), 1
+        while game.getGameEnded(board, cur) == 0 and len(boards) < num:
+            canon = game.getCanonicalForm(board, cur)
+            boards.append(canon)
+            valids = game.getValidMoves(canon, 1)
+            a = int(rng.choice(np.flatnonzero(valids)))
+            board, cur = game.getNextState(board, cur, a)
+    return np.array(boards)
+
+
+def compare_predictions(ref, test, boards):
+    """
+    Accuracy of `test` against `ref` (anything with predict_batch) on the same boards.
+    Returns mean/max policy KL(ref || test) and mean/max absolute value error.
+    """
+    p_ref, v_ref = ref.predict_batch(boards)
+    p_test, v_test = test.predict_batch(boards)
+    eps = 1e-8
+    kl = np.sum(p_ref * (np.log(p_ref + eps) - np.log(p_test + eps)), axis=1)
+    err = np.abs(v_ref - v_test)
+    return {
+        "positions": len(boards),
+        "policy_kl_mean": float(kl.mean()),
+        "policy_kl_max": float(kl.max()),
+        "value_mae": float(err.mean()),
+        "value_max_err": float(err.max()),
+    }
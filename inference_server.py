@@ -0,0 +1,236 @@
+import logging
+import multiprocessing as mp
+import queue
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from network_wrap import NeuralNet
+
+log = logging.getLogger(__name__)
+
+
+HEARTBEAT = 0.5     # seconds between server heartbeats while idle
+
+
+def _layout(num_clients, capacity, board_x, board_y, action_size):
+    """(shape, dtype) of the arrays packed into one shared-memory block."""
+    return [
+        ((num_clients, capacity, board_x, board_y), np.float32),   # boards in
+        ((num_clients, capacity, action_size), np.float32),        # policies out
+        ((num_clients, capacity), np.float32),                     # values out
+        ((num_clients,), np.int32),                                # status: 1 = server failed
+        ((1,), np.float64),                                        # server heartbeat (time.time())
+    ]
+
+
+def _views(buf, shapes):
+    out, off = [], 0
+    for shp, dtype in shapes:
+        arr = np.ndarray(shp, dtype=dtype, buffer=buf, offset=off)
+        out.append(arr)
+        off += arr.nbytes
+    return out
+
+
+def _nbytes(shapes):
+    return sum(int(np.prod(s)) * np.dtype(d).itemsize for s, d in shapes)
+
+
+def _serve(nnet_cls, game, weights, shm_name, shapes, requests, ready, max_batch, max_wait):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    boards_in, pis_out, vs_out, status, heartbeat = _views(shm.buf, shapes)
+    try:
+        nnet = nnet_cls(game)
+        if isinstance(weights, tuple):
+            nnet.load_checkpoint(*weights)
+        elif weights is not None:
+            nnet.set_weights(weights)
+
+        while True:
+            heartbeat[0] = time.time()
+            try:
+                req = requests.get(timeout=HEARTBEAT)
+            except queue.Empty:
+                continue
+            if req is None:
+                break
+            batch, total, stop = [req], req[1], False
+            deadline = time.perf_counter() + max_wait
+            while total < max_batch:
+                left = deadline - time.perf_counter()
+                if left <= 0:
+                    break
+                try:
+                    req = requests.get(timeout=left)
+                except queue.Empty:
+                    break
+                if req is None:
+                    stop = True
+                    break
+                batch.append(req)
+                total += req[1]
+
+            boards = np.concatenate([boards_in[cid, :cnt] for cid, cnt in batch])
+            pis, vs = nnet.predict_batch(boards)
+            i = 0
+            for cid, cnt in batch:
+                pis_out[cid, :cnt] = pis[i:i + cnt]
+                vs_out[cid, :cnt] = vs[i:i + cnt]
+                i += cnt
+                ready[cid].set()
+            if stop:
+                break
+    except Exception:
+        # every waiting (and later) request fails fast instead of blocking
+        log.exception("Inference server failed")
+        status[:] = 1
+        for ev in ready:
+            ev.set()
+    finally:
+        del boards_in, pis_out, vs_out, status, heartbeat
+        shm.close()
+
+
+class RemoteNNet(NeuralNet):
+    """
+    NeuralNet proxy for one worker process: boards go through the shared-memory
+    slot of this client, predictions come back from the InferenceServer.
+    Hand it to the worker as a Process argument (queues/events can't go through a Pool).
+    Raises RuntimeError if the server failed or sent no heartbeat for `timeout` seconds;
+    call close() when the worker is done.
+    """
+
+    def __init__(self, client_id, shm_name, shapes, requests, ready, timeout=60.0):
+        self.client_id = client_id
+        self.shm_name = shm_name
+        self.shapes = shapes
+        self.requests = requests
+        self.ready = ready
+        self.timeout = timeout
+        self.capacity = shapes[0][0][1]
+        self._shm = None
+
+    def __getstate__(self):
+        d = dict(self.__dict__)
+        d["_shm"] = None
+        d.pop("_views", None)
+        return d
+
+    def _slots(self):
+        if self._shm is None:
+            self._shm = shared_memory.SharedMemory(name=self.shm_name)
+            views = _views(self._shm.buf, self.shapes)
+            cid = self.client_id
+            self._views = [v[cid] for v in views[:3]] + [views[3][cid:cid + 1], views[4]]
+        return self._views
+
+    def _check(self, status):
+        if status[0]:
+            raise RuntimeError("Inference server failed (see its log)")
+
+    def _roundtrip(self, boards):
+        boards_in, pis_out, vs_out, status, heartbeat = self._slots()
+        self._check(status)
+        cnt = len(boards)
+        boards_in[:cnt] = boards
+        self.requests.put((self.client_id, cnt))
+        while not self.ready.wait(HEARTBEAT):
+            if time.time() - heartbeat[0] > self.timeout:
+                raise RuntimeError(f"Inference server not responding for {self.timeout:.0f}s")
+        self.ready.clear()
+        self._check(status)
+        return pis_out[:cnt].copy(), vs_out[:cnt].copy()
+
+    def close(self):
+        """Release this client's handle on the shared memory (the server owns the block)."""
+        if self._shm is not None:
+            del self._views
+            self._shm.close()
+            self._shm = None
+
+    def predict(self, board):
+        pis, vs = self._roundtrip(board[None])
+        return pis[0], vs[:1]
+
+    def predict_batch(self, boards):
+        boards = np.asarray(boards)
+        outs = [self._roundtrip(boards[i:i + self.capacity]) for i in range(0, len(boards), self.capacity)]
+        return np.concatenate([p for p, _ in outs]), np.concatenate([v for _, v in outs])
+
+
+class InferenceServer:
+    """
+    One process owns the network and serves batched predictions to `num_clients`
+    worker processes. A batch is flushed when it holds `max_batch` boards or the
+    first request has waited `max_wait_ms`.
+
+        server = InferenceServer(NNetWrapper, game, ('./temp', 'best.pth.tar'), num_clients=4)
+        server.start()
+        nnet = server.client(i)                     # inside worker i
+        mcts = MCTS(game, nnet, args)
+        ...
+        nnet.close()
+        server.stop()
+
+    `weights` is a (folder, filename) checkpoint or a state dict (e.g. from
+    ModelRegistry); None keeps the freshly initialised net.
+    """
+
+    def __init__(self, nnet_cls, game, weights=None, num_clients=4, max_batch=32,
+                 max_wait_ms=2.0, capacity=8, timeout=60.0, ctx=None):
+        self.nnet_cls = nnet_cls
+        self.game = game
+        self.weights = weights
+        self.num_clients = num_clients
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.timeout = timeout
+        self.ctx = ctx or mp.get_context()
+
+        bx, by = game.getBoardSize()
+        self.shapes = _layout(num_clients, capacity, bx, by, game.getActionSize())
+        self.shm = None
+        self.proc = None
+        self.requests = self.ctx.Queue()
+        self.ready = [self.ctx.Event() for _ in range(num_clients)]
+
+    def start(self):
+        self.shm = shared_memory.SharedMemory(create=True, size=_nbytes(self.shapes))
+        status, heartbeat = _views(self.shm.buf, self.shapes)[3:]
+        status[:] = 0
+        heartbeat[0] = time.time()      # grace period while the server loads the net
+        del status, heartbeat
+        self.proc = self.ctx.Process(
+            target=_serve,
+            args=(self.nnet_cls, self.game, self.weights, self.shm.name, self.shapes,
+                  self.requests, self.ready, self.max_batch, self.max_wait),
+            daemon=True,
+        )
+        self.proc.start()
+        log.info("Inference server started (pid=%d, clients=%d)", self.proc.pid, self.num_clients)
+        return self
+
+    def client(self, client_id):
+        assert 0 <= client_id < self.num_clients
+        return RemoteNNet(client_id, self.shm.name, self.shapes, self.requests, self.ready[client_id],
+                          self.timeout)
+
+    def stop(self):
+        if self.proc is not None:
+            self.requests.put(None)
+            self.proc.join(10)
+            if self.proc.is_alive():
+                self.proc.terminate()
+            self.proc = None
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -81,16 +81,22 @@ args = dotdict({
     # ---- Arena(평가) ----
     'arenaCompare': 30,             # 새/구 모델 비교 대국 수
     'updateThreshold': 0.55,        # 승격 기준 승률
+    'arenaOpeningPlies': 4,         # 대국마다 다른 랜덤 오프닝(수 수), 각 오프닝을 양쪽 색으로 (0=초기 국면만)
+    'arenaOpeningBalance': 0.3,     # 이전 모델 가치 |v|가 이 이하인 오프닝 우선 (None=필터 없음)
+    'arenaDedupe': 'count',         # 똑같은 기보 반복: 'count'=세기만, 'skip'=승률 집계에서 제외
 
     # ---- 버퍼/탐색 상수 ----
     'maxlenOfQueue': 200000,        # 학습 데이터 큐 최대 길이
     'cpuct': 1,
+    'endgameEmpties': 8,            # 빈칸이 이 이하이면 MCTS 대신 정확한 엔드게임 솔버 사용 (0=끔, Othello)
+    'solvedTargets': True,          # 솔버로 풀린 국면은 게임 결과 대신 정확한 값을 학습 타깃으로
 
     # ---- 체크포인트/로딩 ----
     'checkpoint': './pretrained_models/mykingdom/',   # 저장 폴더
     'load_model': False,            # 강제 로드 여부(아래 autoresume가 True면 자동 결정)
     'load_folder_file': (None, None), # (폴더, 파일명). autoresume가 채워줌
     'numItersForTrainExamplesHistory': 20,
+    'snapshotHistory': 5,           # 메모리에 유지할 최근 가중치 스냅샷 수 (디스크 저장은 승격 시에만)
 
     # ---- 편의 옵션 ----
     'autoresume': True,             # ✅ 켜두면 중간 재시작 자동 처리
@@ -16,11 +16,16 @@ args = dotdict({
     'maxlenOfQueue': 200000,
     'numMCTSSims': 25,                   # MCTS 탐색 시뮬레이션 수 (작게)
     'arenaCompare': 20,                  # evaluation 시 비교 게임 수
+    'arenaOpeningPlies': 4,              # 비교 대국용 랜덤 오프닝 수 (각 오프닝을 양쪽 색으로, 0=끔)
+    'arenaDedupe': 'count',              # 반복된 기보: 'count' 세기만 / 'skip' 집계 제외
     'cpuct': 1.0,
 
     'checkpoint': './temp_mykingdom/',
     'load_model': False,
     'numItersForTrainExamplesHistory': 20,
+    'snapshotHistory': 5,                # 메모리에 유지할 최근 가중치 스냅샷 수
+    'pruneMoves': False,                 # MCTS에서 자기 영토/죽은 중립 영역 착수 제외
+    'ownershipTargets': False,           # 예제에 최종 소유 맵 저장 (NNet args.ownership_head와 함께 사용)
 })
 
 if __name__ == "__main__":
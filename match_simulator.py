@@ -1,36 +1,111 @@
 import logging
+
+import numpy as np
 from tqdm import tqdm
 
+from base_env import make_state
+
 log = logging.getLogger(__name__)
 
 
+def _symmetry_key(game, board):
+    """Same key for all symmetric copies of a canonical board."""
+    pi = np.zeros(game.getActionSize())
+    return min(np.asarray(b).tobytes() for b, _ in game.getSymmetries(board, pi))
+
+
+def opening_suite(game, plies, count, evaluate=None, max_abs=None, rng=np.random, max_tries=None):
+    """
+    Up to `count` distinct openings: tuples of `plies` random moves from the
+    start position, distinct up to board symmetry. With `evaluate(canonical board)
+    -> value for the side to move`, openings with |value| <= max_abs are
+    preferred and the rest only fill up the suite, most balanced first.
+    """
+    if plies <= 0:
+        return [()]
+    seen = set()
+    kept, spare = [], []
+    max_tries = max_tries or 50 * count
+    for _ in range(max_tries):
+        if len(kept) >= count:
+            break
+        state = make_state(game, game.getInitBoard(), 1)
+        moves = []
+        for _ in range(plies):
+            if state.ended != 0:
+                break
+            a = int(rng.choice(np.flatnonzero(state.valids)))
+            moves.append(a)
+            state = state.next(a)
+        if len(moves) < plies or state.ended != 0:
+            continue
+        key = _symmetry_key(game, state.canonical)
+        if key in seen:
+            continue
+        seen.add(key)
+        if evaluate is None:
+            kept.append(tuple(moves))
+            continue
+        v = abs(float(evaluate(state.canonical)))
+        if max_abs is None or v <= max_abs:
+            kept.append(tuple(moves))
+        else:
+            spare.append((v, tuple(moves)))
+    spare.sort(key=lambda x: x[0])
+    kept += [m for _, m in spare[:count - len(kept)]]
+    return kept or [()]
+
+
 class Arena:
-    def __init__(self, player1, player2, game, display=None):
+    """
+    openings : optional list of action tuples (see opening_suite); playGames
+               plays each one from both colors.
+    dedupe   : "count" (default) only counts repeated game records in
+               self.duplicates, "skip" also leaves them out of the returned W/L/D.
+    """
+
+    def __init__(self, player1, player2, game, display=None, openings=None, dedupe="count"):
         self.player1 = player1
         self.player2 = player2
         self.game = game
         self.display = display
-
-    def playGame(self, verbose=False):
+        self.openings = list(openings) if openings else [()]
+        self.dedupe = dedupe
+        self.last_state = None          # final GameState of the most recent playGame
+        self.last_moves = ()            # actions of the most recent playGame, opening included
+        self.records = set()            # (player1 moved first, actions) of every game played
+        self.duplicates = 0
+
+    def playGame(self, verbose=False, opening=()):
         players = [self.player2, None, self.player1]
-        turn = 1
-        board = self.game.getInitBoard()
-        step = 0
+        state = make_state(self.game, self.game.getInitBoard(), 1)
+        moves = []
 
         for agent in (players[0], players[2]):
             if hasattr(agent, "startGame"):
                 agent.startGame()
 
-        while self.game.getGameEnded(board, turn) == 0:
+        # forced opening moves: both agents are told about them
+        for action in opening:
+            for agent in (players[0], players[2]):
+                if hasattr(agent, "notify"):
+                    agent.notify(state.board, action)
+            state = state.next(action)
+            moves.append(action)
+        turn = state.player
+        step = len(moves)
+
+        while state.ended == 0:
             step += 1
+            board = state.board
 
             if verbose and self.display is not None:
                 print(f"Turn {step} | Player {turn}")
                 self.display(board)
 
-            view = self.game.getCanonicalForm(board, turn)
+            view = state.canonical
             action = players[turn + 1](view)
-            valid = self.game.getValidMoves(view, 1)
+            valid = state.valids
 
             if valid[action] == 0:
                 log.error(f"Invalid action attempted: {action}")
@@ -41,24 +116,40 @@ class Arena:
             if hasattr(opp, "notify"):
                 opp.notify(board, action)
 
-            board, turn = self.game.getNextState(board, turn, action)
+            state = state.next(action)
+            moves.append(int(action))
+            turn = state.player
 
         for agent in (players[0], players[2]):
             if hasattr(agent, "endGame"):
                 agent.endGame()
+        self.last_state = state
+        self.last_moves = tuple(moves)
 
         if verbose and self.display is not None:
-            print(f"Game Over at Turn {step} | Result = {self.game.getGameEnded(board, 1)}")
-            self.display(board)
+            print(f"Game Over at Turn {step} | Result = {self.game.getGameEnded(state.board, 1)}")
+            self.display(state.board)
+
+        return turn * state.ended
 
-        return turn * self.game.getGameEnded(board, turn)
+    def _record(self, p1_first):
+        """Remember the last game; True if the same game was already played."""
+        rec = (p1_first, self.last_moves)
+        if rec in self.records:
+            self.duplicates += 1
+            return True
+        self.records.add(rec)
+        return False
 
     def playGames(self, num, verbose=False):
         half = int(num / 2)
         w1 = w2 = dr = 0
+        dup0 = self.duplicates
 
-        for _ in tqdm(range(half), desc="Arena.playGames (P1 first)"):
-            r = self.playGame(verbose)
+        for i in tqdm(range(half), desc="Arena.playGames (P1 first)"):
+            r = self.playGame(verbose, self.openings[i % len(self.openings)])
+            if self._record(True) and self.dedupe == "skip":
+                continue
             if r == 1:
                 w1 += 1
             elif r == -1:
@@ -68,8 +159,10 @@ class Arena:
 
         self.player1, self.player2 = self.player2, self.player1
 
-        for _ in tqdm(range(half), desc="Arena.playGames (P2 first)"):
-            r = self.playGame(verbose)
+        for i in tqdm(range(half), desc="Arena.playGames (P2 first)"):
+            r = self.playGame(verbose, self.openings[i % len(self.openings)])
+            if self._record(False) and self.dedupe == "skip":
+                continue
             if r == -1:
                 w1 += 1
             elif r == 1:
@@ -77,4 +170,8 @@ class Arena:
             else:
                 dr += 1
 
+        self.player1, self.player2 = self.player2, self.player1
+        if self.duplicates > dup0:
+            log.info("Arena: %d of %d games repeated an earlier game%s", self.duplicates - dup0, 2 * half,
+                     " (not counted)" if self.dedupe == "skip" else "")
         return w1, w2, dr
@@ -0,0 +1,70 @@
+import hashlib
+import logging
+from collections import OrderedDict
+
+log = logging.getLogger(__name__)
+
+
+def content_hash(state):
+    """sha1 over parameter names and raw tensor bytes of a (CPU) state dict."""
+    h = hashlib.sha1()
+    for k, v in state.items():
+        h.update(k.encode())
+        h.update(v.numpy().tobytes())
+    return h.hexdigest()
+
+
+class ModelRegistry:
+    """
+    In-memory, versioned copies of network weights.
+    Keeps the latest `keep` snapshots plus the promoted (best) one; nothing
+    touches the disk unless a snapshot is promoted with a checkpoint folder.
+    """
+
+    def __init__(self, keep=5):
+        self.keep = keep
+        self.snapshots = OrderedDict()   # version -> {'state', 'hash', 'tag'}
+        self.best = None
+        self._next = 0
+
+    def snapshot(self, nnet, tag=""):
+        """Store the current weights of `nnet`; identical weights reuse the existing version."""
+        state = nnet.get_weights()
+        h = content_hash(state)
+        for ver, snap in self.snapshots.items():
+            if snap["hash"] == h:
+                return ver
+        ver = self._next
+        self._next += 1
+        self.snapshots[ver] = {"state": state, "hash": h, "tag": tag}
+        self._trim()
+        return ver
+
+    def _trim(self):
+        while len(self.snapshots) > self.keep:
+            old = next(v for v in self.snapshots if v != self.best)
+            del self.snapshots[old]
+
+    def get(self, version):
+        return self.snapshots[version]["state"]
+
+    def hash(self, version):
+        return self.snapshots[version]["hash"]
+
+    def restore(self, nnet, version):
+        """Copy snapshot `version` into `nnet` (copy to a second net, or roll back)."""
+        nnet.set_weights(self.get(version))
+
+    def promote(self, version, nnet=None, folder=None, filenames=()):
+        """Mark `version` as best; with a folder, write it as checkpoint file(s) via `nnet`."""
+        self.best = version
+        if folder is not None and filenames:
+            self.restore(nnet, version)
+            for fn in filenames:
+                nnet.save_checkpoint(folder=folder, filename=fn)
+        log.info("Promoted snapshot v%d (%s)", version, self.hash(version)[:12])
+
+    def latest(self, k=None):
+        """Versions of the newest `k` snapshots, newest first."""
+        vers = list(reversed(self.snapshots))
+        return vers if k is None else vers[:k]
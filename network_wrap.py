@@ -1,3 +1,6 @@
+import numpy as np
+
+
 class NeuralNet():
 
 
@@ -12,6 +15,25 @@ class NeuralNet():
 
         pass
 
+    def predict_batch(self, boards):
+        """
+        boards: (N, n, n) array -> ((N, A) policies, (N,) values).
+        Fallback for nets without a batched path; override with a single forward pass.
+        An empty batch gives (0, action_size) and (0,) arrays.
+        """
+        if len(boards) == 0:
+            return np.zeros((0, getattr(self, "action_size", 0)), dtype=np.float32), np.zeros(0, dtype=np.float32)
+        pis, vs = zip(*[self.predict(b) for b in boards])
+        return np.array(pis), np.array(vs).reshape(-1)
+
+    def get_weights(self):
+        """CPU copy of the current weights (state dict)."""
+        pass
+
+    def set_weights(self, state):
+
+        pass
+
     def save_checkpoint(self, folder, filename):
 
         pass
@@ -1,6 +1,8 @@
 import numpy as np
 import subprocess
 
+from baseline_players import greedy_player
+
 
 class RandomPlayer:
     def __init__(self, game):
@@ -40,18 +42,14 @@ class HumanOthelloPlayer:
 class GreedyOthelloPlayer:
     def __init__(self, game):
         self.game = game
+        self._greedy = greedy_player("othello", game)
 
     def play(self, board):
-        mask = self.game.getValidMoves(board, 1)
-        cand = []
-        for a in range(self.game.getActionSize()):
-            if not mask[a]:
-                continue
-            nxt, _ = self.game.getNextState(board, 1, a)
-            sc = self.game.getScore(nxt, 1)
-            cand.append((-sc, a))
-        cand.sort()
-        return cand[0][1]
+        # best disc difference after the move, smallest action on ties
+        return self._greedy.play(board)
+
+    def play_batch(self, boards):
+        return self._greedy.play_batch(boards)
 
 
 class GTPOthelloPlayer:
@@ -0,0 +1,198 @@
+import numpy as np
+
+
+class OthelloBatchEnv:
+    """
+    Othello rules for a stack of boards at once.
+    boards: (N, n, n) array in {1, -1, 0}; players: (N,) array (or scalar) of +-1.
+    Results follow OthelloGame exactly (same action indexing, pass = n*n,
+    draws count as -1 in game_ended), only vectorised over N.
+    """
+
+    _dirs = [(1, 1), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0), (-1, 1), (0, 1)]
+
+    def __init__(self, n):
+        self.n = n
+        self.pass_action = n * n
+
+    def _players(self, boards, players):
+        return np.broadcast_to(np.asarray(players), (len(boards),))
+
+    def _shift(self, x, d):
+        """Move every True cell of x by d = (dr, dc); cells leaving the board vanish."""
+        dr, dc = d
+        n = self.n
+        out = np.zeros_like(x)
+        out[:, max(dr, 0):n + min(dr, 0), max(dc, 0):n + min(dc, 0)] = \
+            x[:, max(-dr, 0):n - max(dr, 0), max(-dc, 0):n - max(dc, 0)]
+        return out
+
+    def _sides(self, boards, players):
+        p = self._players(boards, players)[:, None, None]
+        return boards == p, boards == -p
+
+    def _legal(self, own, opp):
+        empty = ~(own | opp)
+        moves = np.zeros_like(own)
+        for d in self._dirs:
+            x = self._shift(own, d) & opp
+            for _ in range(self.n - 3):
+                x |= self._shift(x, d) & opp
+            moves |= self._shift(x, d) & empty
+        return moves
+
+    # --- Game API, batched ---
+
+    def valid_moves(self, boards, players):
+        """(N, n*n+1) int masks; the pass bit is set only when a board has no legal move."""
+        own, opp = self._sides(boards, players)
+        legal = self._legal(own, opp).reshape(len(boards), -1)
+        mask = np.zeros((len(boards), self.pass_action + 1), dtype=int)
+        mask[:, :-1] = legal
+        mask[:, -1] = ~legal.any(axis=1)
+        return mask
+
+    def step(self, boards, players, actions):
+        """Play actions[i] on boards[i] for player players[i]; returns (next_boards, -players)."""
+        players = self._players(boards, players)
+        actions = np.asarray(actions)
+        own, opp = self._sides(boards, players)
+
+        rows = np.flatnonzero(actions != self.pass_action)
+        move = np.zeros_like(own)
+        move.reshape(len(boards), -1)[rows, actions[rows]] = True
+
+        flips = np.zeros_like(own)
+        for d in self._dirs:
+            t = self._shift(move, d)
+            run = np.zeros_like(own)
+            capped = np.zeros(len(boards), dtype=bool)
+            for _ in range(self.n - 1):
+                capped |= (t & own).any(axis=(1, 2))
+                t = t & opp
+                if not t.any():
+                    break
+                run |= t
+                t = self._shift(t, d)
+            flips |= run & capped[:, None, None]
+
+        nxt = np.where(flips | move, players[:, None, None], boards).astype(boards.dtype)
+        return nxt, -players
+
+    def game_ended(self, boards, players):
+        """(N,) like OthelloGame.getGameEnded: 0 while anyone can move, else +-1 for `players`."""
+        own, opp = self._sides(boards, players)
+        live = self._legal(own, opp).any(axis=(1, 2)) | self._legal(opp, own).any(axis=(1, 2))
+        diff = own.sum(axis=(1, 2)) - opp.sum(axis=(1, 2))
+        return np.where(live, 0, np.where(diff > 0, 1, -1))
+
+    def scores(self, boards, players):
+        """(N,) disc difference from `players`' point of view (OthelloGame.getScore)."""
+        own, opp = self._sides(boards, players)
+        return own.sum(axis=(1, 2)) - opp.sum(axis=(1, 2))
+
+    def canonical(self, boards, players):
+        return boards * self._players(boards, players).astype(boards.dtype)[:, None, None]
+
+    # --- random playouts (MCTS rollouts) ---
+
+    def random_playouts(self, boards, players, rng):
+        """
+        Play every board to the end with uniformly random moves (pass only when
+        forced). Returns (N,) results like game_ended for `players`.
+        Boards up to 8x8 run on uint64 bitboards; larger ones step the array env.
+        """
+        players = self._players(boards, players)
+        if self.n > 8:
+            return self._random_playouts_arrays(boards, players, rng)
+        own = self._pack(boards == players[:, None, None])
+        opp = self._pack(boards == -players[:, None, None])
+        sign = np.ones(len(boards), dtype=int)      # +1 while the original player is to move
+        result = np.zeros(len(boards), dtype=int)
+        live = np.arange(len(boards))
+        bits = np.uint64(1) << np.arange(self.n * self.n, dtype=np.uint64)
+        while len(live):
+            legal = self._legal_bits(own, opp)
+            stuck = legal == 0
+            if stuck.any():
+                over = stuck.copy()
+                over[stuck] = self._legal_bits(opp[stuck], own[stuck]) == 0
+                if over.any():
+                    diff = self._popcount(own[over]) - self._popcount(opp[over])
+                    # a draw is -1 for the original player too, as in game_ended
+                    result[live[over]] = np.where(diff == 0, -1, np.where(diff > 0, 1, -1) * sign[over])
+                    keep = ~over
+                    live, own, opp, sign, legal = live[keep], own[keep], opp[keep], sign[keep], legal[keep]
+                    if not len(live):
+                        break
+            keys = rng.rand(len(live), len(bits)) * ((legal[:, None] & bits) != 0)
+            move = np.where(legal != 0, bits[keys.argmax(axis=1)], np.uint64(0))
+            flips = self._flip_bits(own, opp, move)
+            own, opp = opp & ~flips, own | flips | move
+            sign = -sign
+        return result
+
+    def _random_playouts_arrays(self, boards, players, rng):
+        result = np.zeros(len(boards), dtype=int)
+        live = np.arange(len(boards))
+        start = players
+        while len(live):
+            ended = self.game_ended(boards, players)
+            done = ended != 0
+            result[live[done]] = self.game_ended(boards[done], start[live[done]])
+            live, boards, players = live[~done], boards[~done], players[~done]
+            if not len(live):
+                break
+            keys = rng.rand(len(live), self.pass_action + 1) * self.valid_moves(boards, players)
+            boards, players = self.step(boards, players, keys.argmax(axis=1))
+        return result
+
+    def _pack(self, mask):
+        flat = mask.reshape(len(mask), -1)
+        return (flat.astype(np.uint64) << np.arange(flat.shape[1], dtype=np.uint64)).sum(axis=1, dtype=np.uint64)
+
+    @staticmethod
+    def _popcount(x):
+        return np.unpackbits(x.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1).astype(int)
+
+    def _bit_shifts(self):
+        """[(shift, source mask)] per direction; the mask keeps bits whose target is on the board."""
+        if not hasattr(self, "_bshifts"):
+            n = self.n
+            out = []
+            for dr, dc in self._dirs:
+                src = 0
+                for r in range(n):
+                    for c in range(n):
+                        if 0 <= r + dr < n and 0 <= c + dc < n:
+                            src |= 1 << (r * n + c)
+                out.append((dr * n + dc, np.uint64(src)))
+            self._bshifts = out
+        return self._bshifts
+
+    @staticmethod
+    def _sh(x, s, src):
+        x = x & src
+        return x << np.uint64(s) if s > 0 else x >> np.uint64(-s)
+
+    def _legal_bits(self, own, opp):
+        empty = ~(own | opp) & np.uint64((1 << (self.n * self.n)) - 1)
+        moves = np.zeros_like(own)
+        for s, src in self._bit_shifts():
+            x = self._sh(own, s, src) & opp
+            for _ in range(self.n - 3):
+                x |= self._sh(x, s, src) & opp
+            moves |= self._sh(x, s, src) & empty
+        return moves
+
+    def _flip_bits(self, own, opp, move):
+        flips = np.zeros_like(own)
+        for s, src in self._bit_shifts():
+            x = self._sh(move, s, src) & opp
+            run = x
+            for _ in range(self.n - 3):
+                x = self._sh(x, s, src) & opp
+                run |= x
+            capped = (self._sh(run, s, src) & own) != 0
+            flips |= np.where(capped, run, np.uint64(0))
+        return flips
@@ -0,0 +1,84 @@
+import numpy as np
+
+
+class BitBoard:
+    """
+    Othello rules on bitboards: one integer per color, bit r*n+c = square (r, c)
+    (the same index as the action). Python ints are arbitrary width, so the
+    same code serves 6x6, 8x8 (64-bit) and larger boards.
+    """
+
+    def __init__(self, n):
+        self.n = n
+        self.nn = n * n
+        self.nbytes = (self.nn + 7) // 8
+        self.full = (1 << self.nn) - 1
+
+        col0 = col_last = 0
+        for r in range(n):
+            col0 |= 1 << (r * n)
+            col_last |= 1 << (r * n + n - 1)
+        not_col0 = self.full & ~col0
+        not_col_last = self.full & ~col_last
+
+        # (amount, mask) for left and right shifts; the mask drops bits that wrapped a row
+        self.lshifts = [(1, not_col0), (n, self.full), (n + 1, not_col0), (n - 1, not_col_last)]
+        self.rshifts = [(1, not_col_last), (n, self.full), (n + 1, not_col_last), (n - 1, not_col0)]
+
+    # --- conversion ---
+
+    def from_array(self, board, color):
+        flat = np.asarray(board).reshape(-1) == color
+        return int.from_bytes(np.packbits(flat, bitorder="little").tobytes(), "little")
+
+    def to_mask(self, bits):
+        raw = np.frombuffer(bits.to_bytes(self.nbytes, "little"), dtype=np.uint8)
+        return np.unpackbits(raw, bitorder="little", count=self.nn)
+
+    # --- rules ---
+
+    def legal_moves(self, own, opp):
+        empty = self.full & ~(own | opp)
+        moves = 0
+        runs = self.n - 3
+        for s, mask in self.lshifts:
+            x = (own << s) & mask & opp
+            for _ in range(runs):
+                x |= (x << s) & mask & opp
+            moves |= (x << s) & mask & empty
+        for s, mask in self.rshifts:
+            x = (own >> s) & mask & opp
+            for _ in range(runs):
+                x |= (x >> s) & mask & opp
+            moves |= (x >> s) & mask & empty
+        return moves
+
+    def flips(self, own, opp, move):
+        """Bits flipped by playing the single bit `move` (0 if the move flips nothing)."""
+        out = 0
+        for s, mask in self.lshifts:
+            f = 0
+            t = (move << s) & mask
+            while t & opp:
+                f |= t
+                t = (t << s) & mask
+            if t & own:
+                out |= f
+        for s, mask in self.rshifts:
+            f = 0
+            t = (move >> s) & mask
+            while t & opp:
+                f |= t
+                t = (t >> s) & mask
+            if t & own:
+                out |= f
+        return out
+
+    def play(self, own, opp, move):
+        """(own, opp) after `move`; both from the mover's point of view."""
+        f = self.flips(own, opp, move)
+        return own | f | move, opp & ~f
+
+    @staticmethod
+    def count(bits):
+        return bin(bits).count("1")
@@ -2,8 +2,11 @@ from __future__ import print_function
 import sys
 sys.path.append('..')
 
-from base_env import Game
+from base_env import Game, GameState
 from .othello_board import Board
+from .othello_bitboard import BitBoard
+from .othello_solver import EndgameSolver
+from zobrist import ZobristTable
 import numpy as np
 
 
@@ -19,15 +22,25 @@ class OthelloGame(Game):
     def getSquarePiece(cell):
         return OthelloGame.square_content[cell]
 
-    def __init__(self, n):
+    def __init__(self, n, backend="bitboard"):
+        # backend: "bitboard" (BitBoard, 기본) 또는 "board" (기존 Board, 레퍼런스 구현)
         self.n = n
+        self.backend = backend
+        self.bb = BitBoard(n) if backend == "bitboard" else None
+        self.zobrist = ZobristTable(n * n, seed=n)
+        self._solver = None
 
     # --- Game API ---
 
+    def makeState(self, board, player=1):
+        if self.bb is None:
+            return GameState(self, board, player)
+        return OthelloState(self, board, player)
+
     def getInitBoard(self):
-        """초기 보드 상태 반환 (numpy array)"""
+        """초기 보드 상태 반환 (numpy int8 array)"""
         bd = Board(self.n)
-        return np.array(bd.pieces)
+        return np.array(bd.pieces, dtype=np.int8)
 
     def getBoardSize(self):
         return (self.n, self.n)
@@ -43,6 +56,16 @@ class OthelloGame(Game):
             return (board, -player)
 
         # 일반 착수
+        if self.bb is not None:
+            own = self.bb.from_array(board, player)
+            opp = self.bb.from_array(board, -player)
+            move = 1 << int(action)
+            flips = self.bb.flips(own, opp, move)
+            assert flips, f"Invalid move {action}"
+            nb = np.copy(board)
+            nb.reshape(-1)[self.bb.to_mask(flips | move).astype(bool)] = player
+            return (nb, -player)
+
         env = Board(self.n)
         env.pieces = np.copy(board)
         r, c = divmod(int(action), self.n)
@@ -51,6 +74,15 @@ class OthelloGame(Game):
 
     def getValidMoves(self, board, player):
 
+        if self.bb is not None:
+            legal = self.bb.legal_moves(self.bb.from_array(board, player), self.bb.from_array(board, -player))
+            mask = np.zeros(self.getActionSize(), dtype=int)
+            if legal == 0:
+                mask[-1] = 1
+            else:
+                mask[:-1] = self.bb.to_mask(legal)
+            return mask
+
         mask = [0] * self.getActionSize()
 
         env = Board(self.n)
@@ -67,6 +99,13 @@ class OthelloGame(Game):
 
     def getGameEnded(self, board, player):
 
+        if self.bb is not None:
+            own = self.bb.from_array(board, player)
+            opp = self.bb.from_array(board, -player)
+            if self.bb.legal_moves(own, opp) or self.bb.legal_moves(opp, own):
+                return 0
+            return 1 if self.bb.count(own) > self.bb.count(opp) else -1
+
         env = Board(self.n)
         env.pieces = np.copy(board)
 
@@ -80,8 +119,8 @@ class OthelloGame(Game):
         return 1 if env.countDiff(player) > 0 else -1
 
     def getCanonicalForm(self, board, player):
-        # 항상 현재 플레이어 관점(+1)으로 정규화
-        return player * board
+        # 항상 현재 플레이어 관점(+1)으로 정규화 (dtype 유지: int8)
+        return np.int8(player) * board
 
     def getSymmetries(self, board, pi):
 
@@ -103,11 +142,31 @@ class OthelloGame(Game):
         # bytes 형태 유지 (기존 코드 호환)
         return board.tobytes()
 
+    def solveEndgame(self, board, max_empties):
+        """
+        canonical board(+1 차례) -> (value, action, disc diff) under perfect play,
+        or None when more than `max_empties` squares are empty.
+        value follows getGameEnded(board, 1): 1 if the final diff > 0 else -1.
+        """
+        if int(np.count_nonzero(board == 0)) > max_empties:
+            return None
+        if self._solver is None:
+            self._solver = EndgameSolver(self.n)
+        bb = self._solver.bb
+        diff, action = self._solver.solve(bb.from_array(board, 1), bb.from_array(board, -1))
+        return (1 if diff > 0 else -1), action, diff
+
+    def hashKey(self, board):
+        # 64-bit Zobrist hash (MCTS 테이블 키); GameState는 착수/뒤집기마다 증분 갱신
+        return self.zobrist.hash(board)
+
     def stringRepresentationReadable(self, board):
         # 사람이 읽기 쉬운 문자열
         return "".join(self.square_content[val] for row in board for val in row)
 
     def getScore(self, board, player):
+        if self.bb is not None:
+            return int(np.sum(board == player)) - int(np.sum(board == -player))
         env = Board(self.n)
         env.pieces = np.copy(board)
         return env.countDiff(player)
@@ -121,3 +180,69 @@ class OthelloGame(Game):
             row = " ".join(OthelloGame.square_content[board[r][c]] for c in range(n))
             print(f"{r} | {row} |")
         print("-----------------------")
+
+
+class OthelloState(GameState):
+    """
+    GameState on the bitboard backend: keeps (own, opp) bits of the mover, so the
+    legal-move set is computed once for valids and ended, and successors are built
+    from the bits instead of re-reading the array.
+    """
+
+    def __init__(self, game, board, player=1, own=None, opp=None, hashes=None):
+        super().__init__(game, board, player, hashes)
+        bb = game.bb
+        self.own = bb.from_array(board, player) if own is None else own
+        self.opp = bb.from_array(board, -player) if opp is None else opp
+        self._legal = None
+
+    @property
+    def legal(self):
+        if self._legal is None:
+            self._legal = self.game.bb.legal_moves(self.own, self.opp)
+        return self._legal
+
+    @property
+    def valids(self):
+        if self._valids is None:
+            mask = np.zeros(self.game.getActionSize(), dtype=int)
+            if self.legal == 0:
+                mask[-1] = 1
+            else:
+                mask[:-1] = self.game.bb.to_mask(self.legal)
+            self._valids = mask
+        return self._valids
+
+    @property
+    def ended(self):
+        if self._ended is None:
+            bb = self.game.bb
+            if self.legal or bb.legal_moves(self.opp, self.own):
+                self._ended = 0
+            else:
+                self._ended = 1 if bb.count(self.own) > bb.count(self.opp) else -1
+        return self._ended
+
+    def canonical_state(self):
+        if self.player == 1:
+            return self
+        if self._canon_state is None:
+            hashes = None if self._hashes is None else self._hashes[::-1]
+            self._canon_state = OthelloState(self.game, self.canonical, 1, self.own, self.opp, hashes)
+        return self._canon_state
+
+    def _successor(self, action):
+        n = self.game.n
+        if action == n * n:
+            return OthelloState(self.game, self.board, -self.player, self.opp, self.own, self._hashes)
+        bb = self.game.bb
+        move = 1 << int(action)
+        flips = bb.flips(self.own, self.opp, move)
+        assert flips, f"Invalid move {action}"
+        nb = np.copy(self.board)
+        nb.reshape(-1)[bb.to_mask(flips | move).astype(bool)] = self.player
+        hashes = self._hashes
+        if hashes is not None:
+            z = self.game.zobrist
+            hashes = z.flip_bits(z.place(hashes, self.player, int(action)), flips)
+        return OthelloState(self.game, nb, -self.player, self.opp & ~flips, self.own | flips | move, hashes)
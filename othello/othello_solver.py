@@ -0,0 +1,107 @@
+from .othello_bitboard import BitBoard
+
+INF = 10 ** 6
+
+
+class EndgameSolver:
+    """
+    Exact Othello endgame solver: negamax alpha-beta on bitboards with a
+    transposition table (bounds + best move) and move ordering
+    (TT move, corners, then fewest opponent replies).
+    Scores are final disc differences for the side to move, as in getScore.
+    The table is kept across solves (MCTS solves many related positions) but
+    holds at most `max_tt` entries in two generations: when the current one
+    reaches max_tt / 2 it replaces the old one, so the oldest half is dropped.
+    """
+
+    def __init__(self, n, max_tt=100000):
+        self.n = n
+        self.bb = BitBoard(n)
+        self.max_tt = max_tt
+        self.tt = {}
+        self.tt_old = {}
+        self.nodes = 0
+        last = n - 1
+        self.corners = (1 << 0) | (1 << last) | (1 << (last * n)) | (1 << (n * n - 1))
+
+    def empties(self, own, opp):
+        return self.n * self.n - self.bb.count(own | opp)
+
+    def solve(self, own, opp):
+        """(disc difference under perfect play, best action) for the side owning `own`."""
+        score = self._negamax(own, opp, -INF, INF)
+        entry = self._probe((own, opp))
+        move = entry[2] if entry is not None else 0
+        action = move.bit_length() - 1 if move else self.n * self.n
+        return score, action
+
+    def _probe(self, key):
+        entry = self.tt.get(key)
+        if entry is None:
+            entry = self.tt_old.get(key)
+        return entry
+
+    def _store(self, key, entry):
+        self.tt[key] = entry
+        if len(self.tt) >= self.max_tt // 2:
+            self.tt_old = self.tt
+            self.tt = {}
+
+    def _order(self, own, opp, moves, tt_move):
+        bb = self.bb
+        out = []
+        while moves:
+            mv = moves & -moves
+            moves ^= mv
+            if mv == tt_move:
+                key = -1
+            elif mv & self.corners:
+                key = 0
+            else:
+                no, nopp = bb.play(own, opp, mv)
+                key = 1 + bb.count(bb.legal_moves(nopp, no))
+            out.append((key, mv))
+        out.sort()
+        return [mv for _, mv in out]
+
+    def _negamax(self, own, opp, alpha, beta):
+        self.nodes += 1
+        bb = self.bb
+        key = (own, opp)
+        entry = self._probe(key)
+        tt_move = 0
+        if entry is not None:
+            lo, hi, tt_move = entry
+            if lo >= beta:
+                return lo
+            if hi <= alpha:
+                return hi
+            if lo == hi:
+                return lo
+            alpha, beta = max(alpha, lo), min(beta, hi)
+
+        moves = bb.legal_moves(own, opp)
+        if not moves:
+            if not bb.legal_moves(opp, own):
+                return bb.count(own) - bb.count(opp)
+            return -self._negamax(opp, own, -beta, -alpha)
+
+        a0 = alpha
+        best, best_mv = -INF, 0
+        for mv in self._order(own, opp, moves, tt_move):
+            f = bb.flips(own, opp, mv)
+            v = -self._negamax(opp & ~f, own | f | mv, -beta, -alpha)
+            if v > best:
+                best, best_mv = v, mv
+                if v > alpha:
+                    alpha = v
+                    if alpha >= beta:
+                        break
+
+        if best <= a0:
+            self._store(key, (-INF, best, best_mv))
+        elif best >= beta:
+            self._store(key, (best, INF, best_mv))
+        else:
+            self._store(key, (best, best, best_mv))
+        return best
@@ -8,6 +8,7 @@ from tqdm import tqdm
 sys.path.append('../../')
 from utils import *
 from network_wrap import NeuralNet
+from inference_engine import InferenceEngine, compare_predictions, sample_positions
 
 import torch
 import torch.optim as optim
@@ -21,6 +22,8 @@ args = dotdict({
     'batch_size': 64,
     'cuda': torch.cuda.is_available(),
     'num_channels': 512,
+    'fast_inference': True,   # folded-BN TorchScript engine for predict()
+    'int8_inference': False,  # int8 engine on CPU (see NNetWrapper.quantize); training stays float
 })
 
 
@@ -29,6 +32,10 @@ class NNetWrapper(NeuralNet):
         self.nnet = onnet(game, args)
         self.board_x, self.board_y = game.getBoardSize()
         self.action_size = game.getActionSize()
+        self.game = game
+        self._engine = None
+        self._int8 = args.int8_inference
+        self._calib = None
 
         if args.cuda:
             self.nnet.cuda()
@@ -50,8 +57,8 @@ class NNetWrapper(NeuralNet):
             t = tqdm(range(batch_count), desc='Training Net')
             for _ in t:
                 sample_ids = np.random.randint(len(examples), size=args.batch_size)
-                boards, pis, vs = list(zip(*[examples[i] for i in sample_ids]))
-                boards = torch.FloatTensor(np.array(boards).astype(np.float64))
+                boards, pis, vs = list(zip(*[examples[i][:3] for i in sample_ids]))
+                boards = torch.from_numpy(np.array(boards, dtype=np.float32))
                 target_pis = torch.FloatTensor(np.array(pis))
                 target_vs = torch.FloatTensor(np.array(vs).astype(np.float64))
 
@@ -75,10 +82,15 @@ class NNetWrapper(NeuralNet):
                 total_loss.backward()
                 optimizer.step()
 
+        self._engine = None
+
     def predict(self, board):
         """
         board: np array with board
         """
+        if args.fast_inference or self._int8:
+            return self.inference_engine().predict(board)
+
         # timing
         start = time.time()
 
@@ -93,12 +105,54 @@ class NNetWrapper(NeuralNet):
         # print('PREDICTION TIME TAKEN : {0:03f}'.format(time.time()-start))
         return torch.exp(pi).data.cpu().numpy()[0], v.data.cpu().numpy()[0]
 
+    def predict_batch(self, boards):
+        """
+        boards: (N, board_x, board_y) np array
+        returns: (N, action_size) policies, (N,) values
+        """
+        if args.fast_inference or self._int8:
+            return self.inference_engine().predict_batch(boards)
+
+        boards = torch.FloatTensor(np.asarray(boards, dtype=np.float32))
+        if args.cuda: boards = boards.contiguous().cuda()
+        boards = boards.view(-1, self.board_x, self.board_y)
+        self.nnet.eval()
+        with torch.no_grad():
+            pi, v = self.nnet(boards)
+        return torch.exp(pi).data.cpu().numpy(), v.data.cpu().numpy().reshape(-1)
+
+    def inference_engine(self):
+        """Inference-only copy of the net, rebuilt when the weights changed."""
+        if self._engine is None or self._engine.is_stale():
+            self.nnet.eval()
+            self._engine = InferenceEngine(self.nnet, int8=self._int8, calib_boards=self._calib)
+        return self._engine
+
+    def quantize(self, num_positions=256, seed=0):
+        """
+        Switch MCTS inference to an int8 CPU engine and report its accuracy
+        against the float engine on random positions. self.nnet stays float.
+        """
+        boards = sample_positions(self.game, num_positions, seed)
+        self.nnet.eval()
+        ref = InferenceEngine(self.nnet)
+        self._int8, self._calib = True, boards
+        self._engine = None
+        return compare_predictions(ref, self.inference_engine(), boards)
+
     def loss_pi(self, targets, outputs):
         return -torch.sum(targets * outputs) / targets.size()[0]
 
     def loss_v(self, targets, outputs):
         return torch.sum((targets - outputs.view(-1)) ** 2) / targets.size()[0]
 
+    def get_weights(self):
+        return {k: v.detach().cpu().clone() for k, v in self.nnet.state_dict().items()}
+
+    def set_weights(self, state):
+        self.nnet.load_state_dict(state)
+        self._engine = None
+
     def save_checkpoint(self, folder='checkpoint', filename='checkpoint.pth.tar'):
         filepath = os.path.join(folder, filename)
         if not os.path.exists(folder):
@@ -118,3 +172,4 @@ class NNetWrapper(NeuralNet):
         map_location = None if args.cuda else 'cpu'
         checkpoint = torch.load(filepath, map_location=map_location)
         self.nnet.load_state_dict(checkpoint['state_dict'])
+        self._engine = None
@@ -0,0 +1,152 @@
+"""
+Perft for the rule engines: count leaf nodes to a fixed depth, compare every
+backend against the reference implementation and report nodes per second.
+
+    python perft.py --game othello --board 8 --depth 5
+    python perft.py --game mykingdom --board 9 --depth 3 --positions 2
+
+A pass is a ply and finished games are leaves. From a test suite call
+`check(...)`, which raises AssertionError on any mismatch.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from base_env import make_state
+
+# published perft counts for standard 8x8 Othello from the initial position
+KNOWN = {
+    ("othello", 8): {1: 4, 2: 12, 3: 56, 4: 244, 5: 1396, 6: 8200, 7: 55092},
+}
+
+
+def perft_game(game, board, player, depth):
+    """Plain Game API: getGameEnded / getValidMoves / getNextState."""
+    if depth == 0 or game.getGameEnded(board, player) != 0:
+        return 1
+    valids = game.getValidMoves(board, player)
+    total = 0
+    for a in np.flatnonzero(valids):
+        nb, np_ = game.getNextState(board, player, int(a))
+        total += perft_game(game, nb, np_, depth - 1)
+    return total
+
+
+def perft_state(game, board, player, depth):
+    """GameState path (what MCTS / Coach / Arena use)."""
+    def rec(st, d):
+        if d == 0 or st.ended != 0:
+            return 1
+        return sum(rec(st._successor(int(a)), d - 1) for a in np.flatnonzero(st.valids))
+    return rec(make_state(game, board, player), depth)
+
+
+def perft_batch(env, board, player, depth):
+    """Batched env: expand one whole ply at a time."""
+    boards = board[None].copy()
+    players = np.array([player])
+    leaves = 0
+    for _ in range(depth):
+        live = env.game_ended(boards, players) == 0
+        leaves += int(np.count_nonzero(~live))
+        boards, players = boards[live], players[live]
+        if len(boards) == 0:
+            return leaves
+        rows, acts = np.nonzero(env.valid_moves(boards, players))
+        boards, players = env.step(boards[rows], players[rows], acts)
+    return leaves + len(boards)
+
+
+def backends(name, n):
+    """{backend name: perft(board, player, depth)}; the first entry is the reference."""
+    if name == "othello":
+        from othello.othello_env import OthelloGame
+        from othello.othello_batch import OthelloBatchEnv
+        ref, fast, env = OthelloGame(n, backend="board"), OthelloGame(n), OthelloBatchEnv(n)
+        return ref, {
+            "board": lambda b, p, d: perft_game(ref, b, p, d),
+            "bitboard": lambda b, p, d: perft_game(fast, b, p, d),
+            "state": lambda b, p, d: perft_state(fast, b, p, d),
+            "batch": lambda b, p, d: perft_batch(env, b, p, d),
+        }
+    from games.mykingdom.MyKingdomGame import MyKingdomGame
+    from games.mykingdom.mykingdom_batch import MyKingdomBatchEnv
+    ref, env = MyKingdomGame(n), MyKingdomBatchEnv(n)
+    return ref, {
+        "game": lambda b, p, d: perft_game(ref, b, p, d),
+        "state": lambda b, p, d: perft_state(ref, b, p, d),
+        "batch": lambda b, p, d: perft_batch(env, b, p, d),
+    }
+
+
+def positions(game, count, seed=0):
+    """Initial position plus `count` fixed positions from seeded random play."""
+    rng = np.random.RandomState(seed)
+    out = [("init", game.getInitBoard(), 1)]
+    while len(out) < count + 1:
+        board, player = game.getInitBoard(), 1
+        plies = rng.randint(4, 4 + 2 * game.getBoardSize()[0])
+        for _ in range(plies):
+            if game.getGameEnded(board, player) != 0:
+                break
+            valids = game.getValidMoves(board, player)
+            board, player = game.getNextState(board, player, int(rng.choice(np.flatnonzero(valids))))
+        if game.getGameEnded(board, player) == 0:
+            out.append((f"pos{len(out)}", board, player))
+    return out
+
+
+def run(name, n, depth, num_positions=3, seed=0, verbose=True):
+    """Perft every backend on every position; returns rows and raises on mismatch."""
+    ref_game, fns = backends(name, n)
+    rows = []
+    for label, board, player in positions(ref_game, num_positions, seed):
+        counts = {}
+        for bname, fn in fns.items():
+            t = time.perf_counter()
+            nodes = fn(board, player, depth)
+            dt = time.perf_counter() - t
+            counts[bname] = nodes
+            rows.append((label, bname, nodes, dt))
+            if verbose:
+                print(f"{name} {n}x{n} {label:>5} d={depth} {bname:>8}: {nodes:>10} nodes "
+                      f"{dt:8.3f}s {nodes / max(dt, 1e-9):>12,.0f} nps")
+        ref_name = next(iter(fns))
+        bad = {b: c for b, c in counts.items() if c != counts[ref_name]}
+        assert not bad, f"perft mismatch at {label}: {ref_name}={counts[ref_name]} vs {bad}"
+        if label == "init":
+            want = KNOWN.get((name, n), {}).get(depth)
+            assert want is None or counts[ref_name] == want, f"perft({depth}) = {counts[ref_name]}, expected {want}"
+    return rows
+
+
+def check(name="othello", n=6, depth=3, num_positions=3):
+    """Cross-check all backends (quiet); for use from tests."""
+    run(name, n, depth, num_positions, verbose=False)
+    return True
+
+
+def main():
+    ap = argparse.ArgumentParser("Perft correctness/speed benchmark for the rule engines")
+    ap.add_argument("--game", choices=["othello", "mykingdom"], default="othello")
+    ap.add_argument("--board", type=int, default=6)
+    ap.add_argument("--depth", type=int, default=4)
+    ap.add_argument("--positions", type=int, default=3, help="fixed positions besides the initial one")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    rows = run(args.game, args.board, args.depth, args.positions, args.seed)
+    print("-" * 60)
+    totals = {}
+    for _, bname, nodes, dt in rows:
+        t = totals.setdefault(bname, [0, 0.0])
+        t[0] += nodes
+        t[1] += dt
+    for bname, (nodes, dt) in totals.items():
+        print(f"{bname:>8}: {nodes / max(dt, 1e-9):>12,.0f} nps  ({nodes} nodes, {dt:.2f}s)")
+    print("all backends agree")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,8 +19,8 @@ def load_nnet(game, ckpt_dir, ckpt_file):
     return nnet
 
 
-def mcts_agent(game, nnet, sims=200, cpuct=1.0, temp=0.0):
-    mcts = MCTS(game, nnet, args=dotdict({'numMCTSSims': sims, 'cpuct': cpuct}))
+def mcts_agent(game, nnet, sims=200, cpuct=1.0, temp=0.0, endgame=0):
+    mcts = MCTS(game, nnet, args=dotdict({'numMCTSSims': sims, 'cpuct': cpuct, 'endgameEmpties': endgame}))
     def _act(board):
         pi = mcts.getActionProb(board, temp=temp)
         a = int(np.argmax(pi))
@@ -82,11 +82,16 @@ def main():
     ap.add_argument("--sims", type=int, default=200, help="MCTS sims per move")
     ap.add_argument("--cpuct", type=float, default=1.0, help="MCTS cpuct")
     ap.add_argument("--temp", type=float, default=0.0, help="MCTS temperature")
+    ap.add_argument("--endgame", type=int, default=10, help="exact endgame solver at <= this many empties (0=off)")
+    ap.add_argument("--int8", action="store_true", help="int8 quantized CPU inference for MCTS")
     args = ap.parse_args()
 
     game = Game(args.board)
     nnet = load_nnet(game, args.ckpt_dir, args.ckpt_file)
-    ai = mcts_agent(game, nnet, sims=args.sims, cpuct=args.cpuct, temp=args.temp)
+    if args.int8:
+        rep = nnet.quantize()
+        print(f"[int8] policy KL={rep['policy_kl_mean']:.2e}, value MAE={rep['value_mae']:.2e}")
+    ai = mcts_agent(game, nnet, sims=args.sims, cpuct=args.cpuct, temp=args.temp, endgame=args.endgame)
 
     human_as = 1 if args.human_color == "black" else -1  # 사람이 맡는 플레이어 값
     board = game.getInitBoard()
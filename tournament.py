@@ -0,0 +1,263 @@
+"""
+Tournament runner: checkpoints and baselines, round robin or gauntlet,
+games spread over a process pool, Elo fit with confidence intervals.
+
+    python tournament.py --game othello --board 6 --games 20 --sims 50 \\
+        --players temp/checkpoint_3.pth.tar temp/best.pth.tar greedy random
+    python tournament.py --game mykingdom --board 9 --mode gauntlet \\
+        --players temp_mykingdom/best.pth.tar random greedy mcts_rollout
+
+Players are checkpoint paths or the baselines random / greedy / mcts_rollout.
+In gauntlet mode the first player meets every other player; round robin
+plays all pairs.
+
+Finished games are cached in --cache (JSON), keyed by the players' identities
+(content hash of the checkpoint weights, baseline name + parameters) and the
+search settings. A re-run only plays the games a pairing is still missing.
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import math
+import multiprocessing as mp
+import os
+import time
+
+import numpy as np
+
+from match_simulator import Arena
+from utils import dotdict
+
+BASELINES = ("random", "greedy", "mcts_rollout")
+
+
+# ---------------- players ----------------
+
+def make_game(name, n):
+    if name == "othello":
+        from othello.othello_env import OthelloGame
+        return OthelloGame(n)
+    from games.mykingdom.MyKingdomGame import MyKingdomGame
+    return MyKingdomGame(n)
+
+
+def nnet_class(name):
+    if name == "othello":
+        from othello.pytorch.NNet import NNetWrapper
+    else:
+        from games.mykingdom.pytorch.NNet import NNetWrapper
+    return NNetWrapper
+
+
+def player_id(spec, settings):
+    """Stable identity of a player: weights hash for checkpoints, name + parameters for baselines."""
+    if spec == "mcts_rollout":
+        return (f"mcts_rollout:sims={settings['sims']},playouts={settings['playouts']},"
+                f"leaf_batch={settings['leaf_batch']}")
+    if spec in BASELINES:
+        return spec
+    import torch
+    from model_registry import content_hash
+    state = torch.load(spec, map_location="cpu")["state_dict"]
+    return "ckpt:" + content_hash({k: v.cpu() for k, v in state.items()})
+
+
+def make_player(spec, game, settings, seed):
+    from baseline_players import greedy_player, rollout_mcts_player
+    name = settings["game"]
+    if spec == "random":
+        rng = np.random.RandomState(seed)
+        return lambda b: int(rng.choice(np.flatnonzero(game.getValidMoves(b, 1))))
+    if spec == "greedy":
+        return greedy_player(name, game).play
+    if spec == "mcts_rollout":
+        return rollout_mcts_player(name, game, sims=settings["sims"], playouts=settings["playouts"],
+                                   cpuct=settings["cpuct"], seed=seed, leaf_batch=settings["leaf_batch"])[0]
+
+    from tree_search import MCTS
+    nnet = nnet_class(name)(game)
+    nnet.load_checkpoint(os.path.dirname(spec) or ".", os.path.basename(spec))
+    mcts = MCTS(game, nnet, dotdict({'numMCTSSims': settings["sims"], 'cpuct': settings["cpuct"],
+                                     'endgameEmpties': settings["endgame"]}))
+    return lambda b: int(np.argmax(mcts.getActionProb(b, temp=0)))
+
+
+# ---------------- scheduling ----------------
+
+def _init_worker():
+    import torch
+    torch.set_num_threads(1)
+
+
+def _play_chunk(task):
+    """Worker: play one chunk of a pairing; returns (key, side, a wins, b wins, draws)."""
+    key, side, spec_a, spec_b, games, settings, seed = task
+    np.random.seed(seed)
+    game = make_game(settings["game"], settings["board"])
+    pa = make_player(spec_a, game, settings, seed)
+    pb = make_player(spec_b, game, settings, seed + 1)
+    w, l, d = Arena(pa, pb, game).playGames(games, verbose=False)
+    return key, side, w, l, d
+
+
+SEARCH_KEYS = ("game", "board", "sims", "cpuct", "endgame")     # settings that change the games
+
+
+def pair_key(id_a, id_b, settings):
+    search = {k: settings[k] for k in SEARCH_KEYS}
+    blob = json.dumps({"players": sorted([id_a, id_b]), "settings": search}, sort_keys=True)
+    return hashlib.sha1(blob.encode()).hexdigest()
+
+
+def pairings(n, mode):
+    if mode == "gauntlet":
+        return [(0, j) for j in range(1, n)]
+    return list(itertools.combinations(range(n), 2))
+
+
+def load_cache(path):
+    if path and os.path.isfile(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def save_cache(cache, path):
+    if not path:
+        return
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def run_tournament(specs, settings, games, mode="roundrobin", workers=4, cache_path="tournament_cache.json",
+                   chunk=4, seed=0):
+    """
+    Play every scheduled pairing up to `games` games (reusing cached ones).
+    Returns (ids, results) with results[(i, j)] = (i wins, j wins, draws).
+    """
+    ids = [player_id(s, settings) for s in specs]
+    cache = load_cache(cache_path)
+    chunk = max(2, chunk - chunk % 2)       # Arena.playGames plays an even number of games
+    tasks = []
+    for i, j in pairings(len(specs), mode):
+        key = pair_key(ids[i], ids[j], settings)
+        entry = cache.setdefault(key, {"players": [ids[i], ids[j]], "wins": [0, 0], "draws": 0, "games": 0})
+        side = 0 if entry["players"][0] == ids[i] else 1     # slot of specs[i] in the cache entry
+        missing = games - entry["games"]
+        while missing > 0:
+            g = min(chunk, missing + missing % 2)            # even (chunk is even): both colors equally often
+            tasks.append((key, side, specs[i], specs[j], g, settings, seed + 2 * len(tasks) + entry["games"]))
+            missing -= g
+
+    if tasks:
+        print(f"[tournament] {len(tasks)} tasks, {sum(t[4] for t in tasks)} new games on {workers} workers")
+        t0 = time.time()
+        with mp.get_context("spawn").Pool(workers, initializer=_init_worker) as pool:
+            for key, side, w, l, d in pool.imap_unordered(_play_chunk, tasks):
+                entry = cache[key]
+                entry["wins"][side] += w
+                entry["wins"][1 - side] += l
+                entry["draws"] += d
+                entry["games"] += w + l + d
+                save_cache(cache, cache_path)             # finished chunks survive an interrupted run
+        print(f"[tournament] done in {time.time() - t0:.1f}s")
+    save_cache(cache, cache_path)
+
+    results = {}
+    for i, j in pairings(len(specs), mode):
+        entry = cache[pair_key(ids[i], ids[j], settings)]
+        side = 0 if entry["players"][0] == ids[i] else 1
+        results[(i, j)] = (entry["wins"][side], entry["wins"][1 - side], entry["draws"])
+    return ids, results
+
+
+# ---------------- Elo ----------------
+
+def fit_elo(n, results, prior=1.0, anchor=0):
+    """
+    Bradley-Terry / Elo maximum likelihood (draws = half a win) with `prior`
+    virtual drawn games per played pairing, so perfect scores stay finite.
+    Ratings are relative to player `anchor` (= 0). Returns (elo, stderr) arrays;
+    stderr comes from the inverse Hessian (observed Fisher information).
+    """
+    wins = np.zeros((n, n))
+    for (i, j), (wi, wj, d) in results.items():
+        if wi + wj + d == 0:
+            continue
+        wins[i, j] += wi + 0.5 * d + 0.5 * prior
+        wins[j, i] += wj + 0.5 * d + 0.5 * prior
+    games = wins + wins.T
+    free = [k for k in range(n) if k != anchor]
+    theta = np.zeros(n)
+    for _ in range(100):
+        p = 1.0 / (1.0 + np.exp(theta[None, :] - theta[:, None]))       # p[i, j] = P(i beats j)
+        grad = (wins - games * p).sum(axis=1)
+        w = games * p * (1 - p)
+        hess = -np.diag(w.sum(axis=1)) + w
+        step = np.linalg.solve(hess[np.ix_(free, free)], grad[free])
+        theta[free] -= step
+        if np.max(np.abs(step)) < 1e-9:
+            break
+    p = 1.0 / (1.0 + np.exp(theta[None, :] - theta[:, None]))
+    w = games * p * (1 - p)
+    hess = -np.diag(w.sum(axis=1)) + w
+    cov = np.zeros((n, n))
+    cov[np.ix_(free, free)] = np.linalg.inv(-hess[np.ix_(free, free)])
+    scale = 400.0 / math.log(10)
+    return theta * scale, np.sqrt(np.maximum(np.diag(cov), 0)) * scale
+
+
+def report(specs, ids, results, z=1.96):
+    n = len(specs)
+    elo, se = fit_elo(n, results)
+    played = np.zeros(n)
+    score = np.zeros(n)
+    for (i, j), (wi, wj, d) in results.items():
+        played[[i, j]] += wi + wj + d
+        score[i] += wi + 0.5 * d
+        score[j] += wj + 0.5 * d
+    print("=" * 78)
+    print(f"{'#':>2} {'player':<36} {'Elo':>7} {'95% CI':>16} {'games':>6} {'score':>6}")
+    for r, k in enumerate(np.argsort(-elo)):
+        ci = f"[{elo[k] - z * se[k]:+.0f}, {elo[k] + z * se[k]:+.0f}]" if k != 0 else "(anchor)"
+        name = specs[k] if len(specs[k]) <= 36 else "..." + specs[k][-33:]
+        print(f"{r + 1:>2} {name:<36} {elo[k]:>+7.0f} {ci:>16} {int(played[k]):>6} "
+              f"{score[k] / max(played[k], 1):>6.3f}")
+    print("-" * 78)
+    for (i, j), (wi, wj, d) in sorted(results.items()):
+        print(f"  {specs[i]} vs {specs[j]}: {wi}/{wj}/{d}")
+    print("=" * 78)
+    return elo, se
+
+
+def main():
+    ap = argparse.ArgumentParser("Round-robin / gauntlet tournament with Elo")
+    ap.add_argument("--game", choices=["othello", "mykingdom"], default="othello")
+    ap.add_argument("--board", type=int, default=6)
+    ap.add_argument("--players", nargs="+", required=True, help=f"checkpoint paths or {'/'.join(BASELINES)}")
+    ap.add_argument("--mode", choices=["roundrobin", "gauntlet"], default="roundrobin")
+    ap.add_argument("--games", type=int, default=20, help="games per pairing (even, both colors)")
+    ap.add_argument("--sims", type=int, default=50)
+    ap.add_argument("--cpuct", type=float, default=1.0)
+    ap.add_argument("--endgame", type=int, default=0, help="Othello exact endgame solver at <= this many empties")
+    ap.add_argument("--playouts", type=int, default=16, help="random playouts per leaf for mcts_rollout")
+    ap.add_argument("--leaf_batch", type=int, default=16, help="leaves evaluated together by mcts_rollout")
+    ap.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) - 1))
+    ap.add_argument("--chunk", type=int, default=4, help="games per pool task (rounded down to even, min 2)")
+    ap.add_argument("--cache", type=str, default="tournament_cache.json", help="result cache ('' = off)")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    settings = {"game": args.game, "board": args.board, "sims": args.sims, "cpuct": args.cpuct,
+                "endgame": args.endgame if args.game == "othello" else 0, "playouts": args.playouts,
+                "leaf_batch": args.leaf_batch}
+    ids, results = run_tournament(args.players, settings, args.games, args.mode, args.workers,
+                                  args.cache, args.chunk, args.seed)
+    report(args.players, ids, results)
+
+
+if __name__ == "__main__":
+    main()
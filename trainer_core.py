@@ -8,12 +8,31 @@ from random import shuffle
 import numpy as np
 from tqdm import tqdm
 
-from match_simulator import Arena
+from base_env import make_state
+from match_simulator import Arena, opening_suite
+from model_registry import ModelRegistry
 from tree_search import MCTS
 
 log = logging.getLogger(__name__)
 
 
+def compact_examples(ex_hist):
+    """
+    Compatibility shim for .examples pickles written before boards were int8:
+    converts every stored board to int8 in place (values are always in {-1, 0, 1}).
+    """
+    converted = 0
+    for ex_buf in ex_hist:
+        for i, ex in enumerate(ex_buf):
+            board = ex[0]
+            if not isinstance(board, np.ndarray) or board.dtype != np.int8:
+                ex_buf[i] = (np.asarray(board).astype(np.int8),) + tuple(ex[1:])
+                converted += 1
+    if converted:
+        log.info(f"Converted {converted} stored boards to int8")
+    return ex_hist
+
+
 class Coach:
     def __init__(self, game, nnet, args):
         self.game = game
@@ -21,31 +40,44 @@ class Coach:
         self.pnet = self.nnet.__class__(self.game)
         self.args = args
         self.mcts = MCTS(self.game, self.nnet, self.args)
+        self.registry = ModelRegistry(keep=self.args.get("snapshotHistory", 5))
         self.ex_hist = []
         self.skip_first = False
 
     def executeEpisode(self):
         buf = []
-        board = self.game.getInitBoard()
-        cur = 1
+        state = make_state(self.game, self.game.getInitBoard(), 1)
         step = 0
 
         while True:
             step += 1
-            cboard = self.game.getCanonicalForm(board, cur)
+            cur = state.player
+            cstate = state.canonical_state()
             tflag = int(step < self.args.tempThreshold)
 
-            probs = self.mcts.getActionProb(cboard, temp=tflag)
-            symset = self.game.getSymmetries(cboard, probs)
-            for b2, p2 in symset:
-                buf.append([b2, cur, p2, None])
+            probs = self.mcts.getActionProb(cstate, temp=tflag)
+            # exact value target for positions the endgame solver has solved
+            exact = None
+            if self.args.get("solvedTargets", False):
+                sol = self.mcts.solved.get(cstate.key)
+                exact = sol[0] if sol is not None else None
+            symset = self.game.getSymmetries(cstate.board, probs)
+            for k, (b2, p2) in enumerate(symset):
+                buf.append([b2, cur, p2, exact, k])
 
             aidx = np.random.choice(len(probs), p=probs)
-            board, cur = self.game.getNextState(board, cur, aidx)
+            state = state.next(aidx)
+            cur = state.player
 
-            res = self.game.getGameEnded(board, cur)
+            res = state.ended
             if res != 0:
-                return [(e[0], e[2], res * ((-1) ** (e[1] != cur))) for e in buf]
+                out = [(e[0], e[2], e[3] if e[3] is not None else res * ((-1) ** (e[1] != cur))) for e in buf]
+                if self.args.get("ownershipTargets", False) and hasattr(self.game, "getOwnershipTarget"):
+                    # final ownership map, in each example's symmetry and from its player's side
+                    own = self.game.getOwnershipTarget(state.board)
+                    own_syms = [o for o, _ in self.game.getSymmetries(own, probs)]
+                    out = [ex + (own_syms[e[4]] * np.int8(e[1]),) for ex, e in zip(out, buf)]
+                return out
 
     def learn(self):
         for it_idx in range(1, self.args.numIters + 1):
@@ -68,8 +100,10 @@ class Coach:
                 flat_examples.extend(e)
             shuffle(flat_examples)
 
-            self.nnet.save_checkpoint(folder=self.args.checkpoint, filename="temp.pth.tar")
-            self.pnet.load_checkpoint(folder=self.args.checkpoint, filename="temp.pth.tar")
+            prev_ver = self.registry.snapshot(self.nnet, tag=f"iter{it_idx - 1}")
+            if self.registry.best is None:
+                self.registry.best = prev_ver
+            self.registry.restore(self.pnet, prev_ver)
 
             pmcts = MCTS(self.game, self.pnet, self.args)
             self.nnet.train(flat_examples)
@@ -80,17 +114,35 @@ class Coach:
                 lambda x: np.argmax(pmcts.getActionProb(x, temp=0)),
                 lambda x: np.argmax(nmcts.getActionProb(x, temp=0)),
                 self.game,
+                openings=self.arenaOpenings(),
+                dedupe=self.args.get("arenaDedupe", "count"),
             )
             prev_w, new_w, d = arena.playGames(self.args.arenaCompare)
 
-            log.info("NEW/PREV WINS : %d / %d ; DRAWS : %d", new_w, prev_w, d)
+            log.info("NEW/PREV WINS : %d / %d ; DRAWS : %d ; distinct games %d",
+                     new_w, prev_w, d, len(arena.records))
             if prev_w + new_w == 0 or float(new_w) / (prev_w + new_w) < self.args.updateThreshold:
                 log.info("Discard new snapshot")
-                self.nnet.load_checkpoint(folder=self.args.checkpoint, filename="temp.pth.tar")
+                self.registry.restore(self.nnet, prev_ver)
             else:
                 log.info("Promote new snapshot")
-                self.nnet.save_checkpoint(folder=self.args.checkpoint, filename=self.getCheckpointFile(it_idx))
-                self.nnet.save_checkpoint(folder=self.args.checkpoint, filename="best.pth.tar")
+                new_ver = self.registry.snapshot(self.nnet, tag=f"iter{it_idx}")
+                self.registry.promote(new_ver, self.nnet, folder=self.args.checkpoint,
+                                      filenames=(self.getCheckpointFile(it_idx), "best.pth.tar"))
+
+    def arenaOpenings(self):
+        """
+        Opening suite for the arena (None = every game from the start position):
+        arenaCompare // 2 openings of arenaOpeningPlies random moves, each played
+        from both colors. With arenaOpeningBalance, openings the previous net
+        values within that margin are preferred.
+        """
+        plies = self.args.get("arenaOpeningPlies", 0)
+        if not plies:
+            return None
+        bal = self.args.get("arenaOpeningBalance", None)
+        evaluate = (lambda b: np.ravel(self.pnet.predict(b)[1])[0]) if bal is not None else None
+        return opening_suite(self.game, plies, max(1, self.args.arenaCompare // 2), evaluate=evaluate, max_abs=bal)
 
     def getCheckpointFile(self, iteration):
         return "checkpoint_" + str(iteration) + ".pth.tar"
@@ -114,6 +166,6 @@ class Coach:
         else:
             log.info("Loading stored examples")
             with open(ex_path, "rb") as f:
-                self.ex_hist = Unpickler(f).load()
+                self.ex_hist = compact_examples(Unpickler(f).load())
             log.info("Loaded examples")
             self.skip_first = True
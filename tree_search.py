@@ -2,6 +2,8 @@ import logging
 import math
 import numpy as np
 
+from base_env import make_state
+
 EPS = 1e-8
 log = logging.getLogger(__name__)
 
@@ -17,12 +19,41 @@ class MCTS:
         self.P_s = {}
         self.term = {}
         self.Vmask = {}
+        self.solved = {}
+        # exact endgame solving below this many empty squares (games with solveEndgame only)
+        self.endgame = args.get("endgameEmpties", 0) if hasattr(game, "solveEndgame") else 0
+        # drop provably dominated moves at expansion (games with getPrunedMoves only)
+        self.prune = args.get("pruneMoves", False) and hasattr(game, "getPrunedMoves")
+        # "tree": Q per edge (default). "dag": values live on nodes, Q(s,a) = -V(child),
+        # so every path into a transposed position sees the same estimate.
+        self.dag = args.get("mctsBackup", "tree") == "dag"
+        self.W_s = {}        # dag: sum of values backed up through s (s to move), incl. the leaf eval
+        self.child = {}      # (s, a) -> key of the canonical child (dag, or trackChildren for stats)
+        self.track_child = self.dag or args.get("trackChildren", False)
+        # leafBatch > 1: collect up to this many leaves per nnet.predict_batch call, using virtual loss
+        self.leaf_batch = args.get("leafBatch", 1)
+        self.vloss = {}      # (s, a) -> pending descents through the edge in the current batch
+        self.vloss_s = {}    # s -> pending descents through the node
 
     def getActionProb(self, canonicalBoard, temp=1):
-        for _ in range(self.args.numMCTSSims):
-            self.search(canonicalBoard)
+        # canonicalBoard may also be a GameState of the canonical position
+        root = make_state(self.game, canonicalBoard)
+        if self.endgame and root.ended == 0:
+            sol = self.solve(root)
+            if sol is not None:
+                probs = [0] * self.game.getActionSize()
+                probs[sol[1]] = 1
+                return probs
+
+        if self.leaf_batch > 1:
+            done = 0
+            while done < self.args.numMCTSSims:
+                done += self.search_batch(root, min(self.leaf_batch, self.args.numMCTSSims - done))
+        else:
+            for _ in range(self.args.numMCTSSims):
+                self.search(root)
 
-        s = self.game.stringRepresentation(canonicalBoard)
+        s = root.key
         counts = [self.N_sa.get((s, a), 0) for a in range(self.game.getActionSize())]
 
         if temp == 0:
@@ -36,28 +67,30 @@ class MCTS:
         tot = float(sum(counts))
         return [x / tot for x in counts]
 
+    def solve(self, state):
+        """Exact (value, action, ...) of a canonical endgame position, or None if not solvable."""
+        s = state.key
+        if s not in self.solved:
+            self.solved[s] = self.game.solveEndgame(state.board, self.endgame)
+        return self.solved[s]
+
     def search(self, canonicalBoard):
-        s = self.game.stringRepresentation(canonicalBoard)
+        state = make_state(self.game, canonicalBoard)
+        s = state.key
 
         if s not in self.term:
-            self.term[s] = self.game.getGameEnded(canonicalBoard, 1)
+            self.term[s] = state.ended
         if self.term[s] != 0:
             return -self.term[s]
 
+        if self.endgame:
+            sol = self.solve(state)
+            if sol is not None:
+                return -sol[0]
+
         if s not in self.P_s:
-            p, v = self.nnet.predict(canonicalBoard)
-            valids = self.game.getValidMoves(canonicalBoard, 1)
-            p = p * valids
-            sm = np.sum(p)
-            if sm > 0:
-                p /= sm
-            else:
-                log.error("All valid moves were masked, doing a workaround.")
-                p = p + valids
-                p /= np.sum(p)
-            self.P_s[s] = p
-            self.Vmask[s] = valids
-            self.N_s[s] = 0
+            p, v = self.nnet.predict(state.board)
+            self.expand(state, p, v)
             return -v
 
         valids = self.Vmask[s]
@@ -68,7 +101,8 @@ class MCTS:
             if not valids[a]:
                 continue
             if (s, a) in self.Q:
-                u = self.Q[(s, a)] + self.args.cpuct * self.P_s[s][a] * math.sqrt(self.N_s[s]) / (1 + self.N_sa[(s, a)])
+                q = -self.node_value(self.child[(s, a)]) if self.dag else self.Q[(s, a)]
+                u = q + self.args.cpuct * self.P_s[s][a] * math.sqrt(self.N_s[s]) / (1 + self.N_sa[(s, a)])
             else:
                 u = self.args.cpuct * self.P_s[s][a] * math.sqrt(self.N_s[s] + EPS)
             if u > best_u:
@@ -76,8 +110,9 @@ class MCTS:
                 best_a = a
 
         a = best_a
-        nxt, ply = self.game.getNextState(canonicalBoard, 1, a)
-        nxt = self.game.getCanonicalForm(nxt, ply)
+        nxt = state.next(a).canonical_state()
+        if self.track_child:
+            self.child[(s, a)] = nxt.key
 
         v = self.search(nxt)
 
@@ -89,4 +124,128 @@ class MCTS:
             self.N_sa[(s, a)] = 1
 
         self.N_s[s] += 1
+        if self.dag:
+            self.W_s[s] += v
         return -v
+
+    def expand(self, state, p, v):
+        """Store the masked prior of a new leaf (and its value in dag mode)."""
+        s = state.key
+        valids = state.valids
+        if self.prune:
+            valids = self.game.getPrunedMoves(state.board, 1, valids)
+        p = p * valids
+        sm = np.sum(p)
+        if sm > 0:
+            p /= sm
+        else:
+            log.error("All valid moves were masked, doing a workaround.")
+            p = p + valids
+            p /= np.sum(p)
+        self.P_s[s] = p
+        self.Vmask[s] = valids
+        self.N_s[s] = 0
+        if self.dag:
+            self.W_s[s] = v
+
+    def search_batch(self, root, k):
+        """
+        Up to k descents from the root, each stopped at a terminal/solved node or a
+        new leaf; virtual loss spreads them over different paths. All new leaves go
+        through one nnet.predict_batch call, then every path is backed up.
+        Descents reaching a leaf already in this batch are dropped.
+        Returns the number of simulations that were backed up.
+        """
+        leaves = {}        # s -> (state, path)
+        known = []         # (path, value for the side to move at the end node)
+        for _ in range(k):
+            path, state, v = self._descend(root)
+            if v is not None:
+                known.append((path, v))
+            elif state.key not in leaves:
+                leaves[state.key] = (state, path)
+        self.vloss.clear()
+        self.vloss_s.clear()
+
+        if leaves:
+            states = [st for st, _ in leaves.values()]
+            pis, vs = self.nnet.predict_batch(np.stack([st.board for st in states]))
+            vs = np.asarray(vs, dtype=np.float32).reshape(-1)
+            for i, (st, path) in enumerate(leaves.values()):
+                self.expand(st, pis[i], vs[i:i + 1])
+                known.append((path, vs[i:i + 1]))
+        for path, v in known:
+            self._backup(path, v)
+        return max(len(known), 1)
+
+    def _descend(self, root):
+        """(path of (s, a), end state, value or None for an unexpanded leaf); adds virtual loss."""
+        state = root
+        path = []
+        while True:
+            s = state.key
+            if s not in self.term:
+                self.term[s] = state.ended
+            if self.term[s] != 0:
+                return path, state, self.term[s]
+            if self.endgame:
+                sol = self.solve(state)
+                if sol is not None:
+                    return path, state, sol[0]
+            if s not in self.P_s:
+                return path, state, None
+            a = self._select_virtual(s)
+            path.append((s, a))
+            self.vloss[(s, a)] = self.vloss.get((s, a), 0) + 1
+            self.vloss_s[s] = self.vloss_s.get(s, 0) + 1
+            nxt = state.next(a).canonical_state()
+            if self.track_child:
+                self.child[(s, a)] = nxt.key
+            state = nxt
+
+    def _select_virtual(self, s):
+        """PUCT choice at s, with each pending descent counted as a lost visit."""
+        valids = self.Vmask[s]
+        n_s = self.N_s[s] + self.vloss_s.get(s, 0)
+        best_u = -float("inf")
+        best_a = -1
+        for a in range(self.game.getActionSize()):
+            if not valids[a]:
+                continue
+            virt = self.vloss.get((s, a), 0)
+            if (s, a) in self.Q:
+                n = self.N_sa[(s, a)]
+                q = -self.node_value(self.child[(s, a)]) if self.dag else self.Q[(s, a)]
+                q = (n * q - virt) / (n + virt)
+                u = q + self.args.cpuct * self.P_s[s][a] * math.sqrt(n_s) / (1 + n + virt)
+            elif virt:
+                u = -1 + self.args.cpuct * self.P_s[s][a] * math.sqrt(n_s) / (1 + virt)
+            else:
+                u = self.args.cpuct * self.P_s[s][a] * math.sqrt(n_s + EPS)
+            if u > best_u:
+                best_u = u
+                best_a = a
+        return best_a
+
+    def _backup(self, path, v):
+        """Back up the end node's value `v` (for its side to move) along `path`, as search() does."""
+        v = -v
+        for s, a in reversed(path):
+            if (s, a) in self.Q:
+                self.Q[(s, a)] = (self.N_sa[(s, a)] * self.Q[(s, a)] + v) / (self.N_sa[(s, a)] + 1)
+                self.N_sa[(s, a)] += 1
+            else:
+                self.Q[(s, a)] = v
+                self.N_sa[(s, a)] = 1
+            self.N_s[s] += 1
+            if self.dag:
+                self.W_s[s] += v
+            v = -v
+
+    def node_value(self, s):
+        """Value of a visited node for its side to move (dag mode)."""
+        if s in self.W_s:
+            return self.W_s[s] / (self.N_s[s] + 1)
+        if self.term.get(s, 0) != 0:
+            return self.term[s]
+        return self.solved[s][0]